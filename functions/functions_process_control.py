@@ -8,15 +8,12 @@ This module provides functions for performing statistical process control (SPC)
 including descriptive statistics, control charts, and process monitoring tools.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
 import pandas as pd
 import numpy as np
-from scipy import stats
-from plotnine import *
-try:
-    import patchworklib as pw
-    PATCHWORK_AVAILABLE = True
-except ImportError:
-    PATCHWORK_AVAILABLE = False
+from scipy import stats, special, signal
 
 
 def describe(x):
@@ -94,6 +91,13 @@ def ggprocess(x, y, xlab='Subgroup', ylab='Metric'):
     >>> water = pd.read_csv("workshops/onsen.csv")
     >>> ggprocess(x=water['time'], y=water['temp'], xlab="Subgroup", ylab="Metric")
     """
+    from plotnine import ggplot, aes, geom_jitter, geom_boxplot, geom_hline, geom_histogram, labs, theme_void, coord_flip
+    try:
+        import patchworklib as pw
+        PATCHWORK_AVAILABLE = True
+    except ImportError:
+        PATCHWORK_AVAILABLE = False
+    
     # Convert vectors to series, and bundle as data.frame
     data = pd.DataFrame({
         'x': pd.Series(x),
@@ -138,7 +142,942 @@ def ggprocess(x, y, xlab='Subgroup', ylab='Metric'):
         return g1
 
 
-def get_stat_s(x, y):
+class SubgroupStats:
+    """
+    Per-Subgroup Sufficient Statistics
+    
+    Holds the count, sum, sum of squared deviations, minimum, and maximum of y for
+    each subgroup x, as NumPy arrays sorted by x. Every subgroup statistic, total
+    statistic, and control limit in this module can be derived from these arrays,
+    so the raw data only needs to be scanned once. Usually built by subgroup_stats().
+    
+    Subgroups may also belong to separate streams (e.g. one per tool or metric),
+    in which case they are sorted by stream, then x, and the stream_* methods
+    summarize each stream separately.
+    
+    Attributes
+    ----------
+    x : np.ndarray
+        Sorted unique subgroup values
+    stream : np.ndarray or None
+        Stream of each subgroup, if any
+    nw : np.ndarray
+        Number of observations per subgroup
+    total : np.ndarray
+        Sum of y per subgroup
+    m2 : np.ndarray
+        Sum of squared deviations from the subgroup mean, per subgroup
+    ymin, ymax : np.ndarray
+        Minimum and maximum of y per subgroup
+    """
+    
+    def __init__(self, x, nw, total, m2, ymin, ymax, stream=None):
+        self.x = np.asarray(x)
+        self.nw = np.asarray(nw, dtype=np.int64)
+        self.total = np.asarray(total, dtype=float)
+        self.m2 = np.asarray(m2, dtype=float)
+        self.ymin = np.asarray(ymin, dtype=float)
+        self.ymax = np.asarray(ymax, dtype=float)
+        self.stream = None if stream is None else np.asarray(stream)
+    
+    def __len__(self):
+        return len(self.x)
+    
+    def __repr__(self):
+        if self.stream is None:
+            return f"SubgroupStats(subgroups={len(self)}, n={self.n})"
+        return f"SubgroupStats(streams={len(self.stream_starts)}, subgroups={len(self)}, n={self.n})"
+    
+    # Accepted names for each column of a summary table
+    _SUMMARY_COLUMNS = {
+        'n': ['n', 'nw', 'count'],
+        'mean': ['mean', 'xbar', 'avg'],
+        'sd': ['sd', 's', 'std'],
+        'min': ['min', 'ymin', 'y_min'],
+        'max': ['max', 'ymax', 'y_max']
+    }
+    
+    @classmethod
+    def from_summary(cls, table, x="x", stream=None):
+        """
+        Build SubgroupStats from a table with one row per subgroup
+        
+        For data already aggregated upstream (e.g. by a historian). The table needs
+        the subgroup column x plus each subgroup's count (n or nw), mean (mean or xbar),
+        and standard deviation (sd or s). Minimum and maximum (min/ymin/y_min and
+        max/ymax/y_max) are optional, and only needed for range charts.
+        
+        Parameters
+        ----------
+        table : pd.DataFrame
+            Summary table with one row per subgroup (per stream, if any)
+        x : str, optional
+            Name of the subgroup column. Default is "x".
+        stream : str, optional
+            Name of the stream column, if any. Default is None.
+        
+        Returns
+        -------
+        SubgroupStats
+            Per-subgroup statistics, sorted by stream, then subgroup.
+        """
+        def column(name, required=True):
+            for option in cls._SUMMARY_COLUMNS[name]:
+                if option in table.columns:
+                    return table[option].to_numpy(dtype=float)
+            if required:
+                raise ValueError(f"summary table needs a '{name}' column (one of: {', '.join(cls._SUMMARY_COLUMNS[name])})")
+            return np.full(len(table), np.nan)
+        
+        keys = [x] if stream is None else [stream, x]
+        if table.duplicated(subset=keys).any():
+            raise ValueError("summary table must have one row per subgroup")
+        order = np.lexsort([table[k].to_numpy() for k in reversed(keys)])
+        nw = column('n')[order]
+        sd = column('sd')[order]
+        if np.any(np.isnan(sd) & (nw > 1)):
+            raise ValueError("summary table is missing 'sd' for subgroups with n > 1")
+        return cls(
+            x=table[x].to_numpy()[order],
+            nw=nw,
+            total=column('mean')[order] * nw,
+            # Subgroups of 1 have no standard deviation, and no squared deviations
+            m2=np.where(nw > 1, sd**2 * (nw - 1), 0),
+            ymin=column('min', required=False)[order],
+            ymax=column('max', required=False)[order],
+            stream=None if stream is None else table[stream].to_numpy()[order]
+        )
+    
+    @property
+    def n(self):
+        """Total number of observations"""
+        return int(self.nw.sum())
+    
+    @property
+    def df(self):
+        """Degrees of freedom per subgroup"""
+        return self.nw - 1
+    
+    @property
+    def xbar(self):
+        """Mean per subgroup"""
+        return self.total / self.nw
+    
+    @property
+    def s(self):
+        """Standard deviation per subgroup (NaN for subgroups of 1)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.nw > 1, np.sqrt(self.m2 / self.df), np.nan)
+    
+    @property
+    def r(self):
+        """Range per subgroup"""
+        return self.ymax - self.ymin
+    
+    @property
+    def sumsq(self):
+        """Sum of squares of y per subgroup"""
+        return self.m2 + self.total**2 / self.nw
+    
+    @property
+    def sigma_s(self):
+        """Pooled within-subgroup standard deviation"""
+        return np.sqrt(self.m2.sum() / self.df.sum())
+    
+    @property
+    def sigma_t(self):
+        """Total standard deviation of all observations"""
+        # Between-subgroup sum of squares, centered on the grand mean
+        mean = self.total.sum() / self.n
+        between = (self.nw * (self.xbar - mean)**2).sum()
+        return np.sqrt((self.m2.sum() + between) / (self.n - 1))
+    
+    @cached_property
+    def stream_starts(self):
+        """Index of the first subgroup in each stream (just [0] without streams)"""
+        if self.stream is None or len(self) == 0:
+            return np.zeros(min(len(self), 1), dtype=np.int64)
+        codes = pd.factorize(self.stream)[0]
+        return np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    
+    def stream_keys(self):
+        """Stream of each stream's subgroups (None without streams)"""
+        return None if self.stream is None else self.stream[self.stream_starts]
+    
+    def stream_sum(self, values):
+        """Sum per-subgroup values within each stream"""
+        return np.add.reduceat(values, self.stream_starts)
+    
+    def stream_mean(self, values):
+        """Average per-subgroup values within each stream, skipping NaN"""
+        values = np.asarray(values, dtype=float)
+        ok = ~np.isnan(values)
+        return self.stream_sum(np.where(ok, values, 0)) / self.stream_sum(ok)
+    
+    def per_subgroup(self, values):
+        """Repeat per-stream values onto each subgroup in that stream"""
+        return np.repeat(values, np.diff(np.r_[self.stream_starts, len(self)]))
+    
+    def stream_sigma_s(self):
+        """Pooled within-subgroup standard deviation of each stream"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.sqrt(self.stream_sum(self.m2) / self.stream_sum(self.df))
+    
+    def stream_sigma_t(self):
+        """Total standard deviation of each stream"""
+        n = self.stream_sum(self.nw)
+        mean = self.stream_sum(self.total) / n
+        between = self.stream_sum(self.nw * (self.xbar - self.per_subgroup(mean))**2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.sqrt((self.stream_sum(self.m2) + between) / (n - 1))
+
+
+def _as_array(values, dtype=None):
+    """
+    Return values as a NumPy array. pyarrow Arrays and ChunkedArrays hand over their
+    buffers directly (zero-copy for a single chunk without nulls), never via pandas.
+    """
+    if type(values).__module__.startswith('pyarrow'):
+        values = values.to_numpy(zero_copy_only=False)
+    return np.asarray(values, dtype=dtype)
+
+
+def _subgroup_codes(x, stream=None):
+    """
+    Code each value's subgroup (and stream), in sorted order. Returns the codes,
+    the subgroup of each code, and the stream of each code (or None).
+    """
+    codes, uniques = pd.factorize(x, sort=True)
+    skeys = None
+    if stream is not None:
+        # Combine stream and subgroup codes, so subgroups sort by stream, then x
+        scodes, skeys = pd.factorize(stream, sort=True)
+        codes, combined = pd.factorize(scodes.astype(np.int64) * len(uniques) + codes, sort=True)
+        uniques, skeys = uniques[combined % len(uniques)], skeys[combined // len(uniques)]
+    return codes, uniques, skeys
+
+
+def subgroup_stats(x, y, stream=None):
+    """
+    Get Subgroup Sufficient Statistics in One Pass
+    
+    Sorts the data by subgroup once, then reduces each subgroup to its count, sum,
+    sum of squared deviations, minimum, and maximum with NumPy. Pass the result to
+    get_stat_s(), get_stat_t(), limits_avg(), limits_s(), limits_r(), or the chart
+    functions in place of x to reuse it without re-grouping the raw data.
+    
+    Parameters
+    ----------
+    x : array-like
+        Vector of subgroup values (usually time). Must be same length as y.
+        NumPy arrays, pandas Series, and pyarrow (Chunked)Arrays are all read
+        without an intermediate DataFrame.
+    y : array-like
+        Vector of metric values (e.g., performance). Must be same length as x.
+    stream : array-like, optional
+        Vector of stream keys (e.g. tool, chamber, or metric). Must be same length as x.
+        If given, subgroups are defined by each unique stream and x. Default is None.
+    
+    Returns
+    -------
+    SubgroupStats
+        Per-subgroup statistics, sorted by subgroup.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> data = subgroup_stats(x=water['time'], y=water['temp'])
+    >>> limits_avg(data)
+    >>> limits_s(data)
+    """
+    x = _as_array(x)
+    y = _as_array(y, dtype=float)
+    keep = ~(pd.isna(x) | np.isnan(y))
+    if stream is not None:
+        stream = _as_array(stream)
+        keep &= ~pd.isna(stream)
+    
+    # Drop missing values, as groupby() would
+    if not keep.all():
+        x, y = x[keep], y[keep]
+        stream = None if stream is None else stream[keep]
+    
+    # Code subgroups in sorted order
+    codes, uniques, skeys = _subgroup_codes(x, stream)
+    
+    # Sort once, unless already sorted
+    if np.any(codes[1:] < codes[:-1]):
+        order = np.argsort(codes, kind='stable')
+        codes, y = codes[order], y[order]
+    
+    # Find where each subgroup starts
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    nw = np.diff(np.r_[starts, len(y)])
+    
+    # Shift values by the first value in their subgroup, for stable sums of squares
+    first = y[starts]
+    d = y - np.repeat(first, nw)
+    dsum = np.add.reduceat(d, starts)
+    dsq = np.add.reduceat(d * d, starts)
+    
+    return SubgroupStats(
+        x=np.asarray(uniques),
+        nw=nw,
+        total=first * nw + dsum,
+        m2=np.maximum(dsq - dsum**2 / nw, 0),
+        ymin=np.minimum.reduceat(y, starts),
+        ymax=np.maximum.reduceat(y, starts),
+        stream=None if stream is None else np.asarray(skeys)
+    )
+
+
+def _as_stats(x, y=None, stream=None):
+    """
+    Return the SubgroupStats behind x, or compute one from x, y, and stream.
+    A data frame x with no y is read as a summary table, with stream as its stream column.
+    """
+    if isinstance(x, SubgroupStats):
+        return x
+    if isinstance(x, SubgroupSummary):
+        return x.stats
+    if isinstance(x, pd.DataFrame) and y is None:
+        return SubgroupStats.from_summary(x, stream=stream)
+    if isinstance(x, MeasurementStore):
+        return x.stats()
+    return subgroup_stats(x, y, stream=stream)
+
+
+def _with_stream(frame, data):
+    """
+    Add a leading stream column to a per-subgroup frame, if data has streams
+    """
+    if data.stream is not None:
+        frame.insert(0, 'stream', data.stream)
+    return frame
+
+
+class SubgroupSummary:
+    """
+    Subgroup Summary with Lazy, Cached Statistics
+    
+    Groups x and y once, then computes each statistic and set of control limits the
+    first time it is asked for, and caches it. Pass a SubgroupSummary in place of x to
+    get_stat_s(), get_stat_t(), limits_avg(), limits_s(), limits_r(), ggxbar(), ggs(),
+    ggr(), or get_index() to reuse that work across calls.
+    
+    Parameters
+    ----------
+    x : array-like, SubgroupStats, or pd.DataFrame
+        Vector of subgroup values (usually time). Must be same length as y.
+        Or, the output of subgroup_stats() or a summary table with one row per
+        subgroup (see SubgroupStats.from_summary()), in which case y is not needed.
+    y : array-like, optional
+        Vector of metric values (e.g., performance). Must be same length as x.
+    
+    Attributes
+    ----------
+    stats : SubgroupStats
+        Per-subgroup sufficient statistics
+    raw : tuple or None
+        The original (x, y) vectors, if given, for resampling individual observations
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> summary = SubgroupSummary(x=water['time'], y=water['temp'])
+    >>> summary.sigma_s
+    >>> ggxbar(summary)
+    >>> ggs(summary)
+    """
+    
+    def __init__(self, x, y=None):
+        self.stats = _as_stats(x, y)
+        self.raw = None if y is None else (x, y)
+    
+    def __repr__(self):
+        return f"SubgroupSummary(subgroups={len(self.stats)}, n={self.stats.n})"
+    
+    @cached_property
+    def xbbar(self):
+        """Grand mean of subgroup means"""
+        return self.stats.xbar.mean()
+    
+    @cached_property
+    def sigma_s(self):
+        """Pooled within-subgroup standard deviation"""
+        return self.stats.sigma_s
+    
+    @cached_property
+    def sigma_t(self):
+        """Total standard deviation"""
+        return self.stats.sigma_t
+    
+    @cached_property
+    def rbar(self):
+        """Average range"""
+        return self.stats.r.mean()
+    
+    @cached_property
+    def sbar(self):
+        """Average subgroup standard deviation"""
+        return np.nanmean(self.stats.s)
+    
+    @cached_property
+    def se(self):
+        """Standard error of each subgroup mean"""
+        return self.sigma_s / np.sqrt(self.stats.nw)
+    
+    @cached_property
+    def stat_s(self):
+        """Output of get_stat_s()"""
+        return get_stat_s(self.stats)
+    
+    @cached_property
+    def stat_t(self):
+        """Output of get_stat_t()"""
+        return get_stat_t(self.stats)
+    
+    @cached_property
+    def limits_avg(self):
+        """Output of limits_avg()"""
+        return limits_avg(self.stats)
+    
+    @cached_property
+    def limits_s(self):
+        """Output of limits_s()"""
+        return limits_s(self.stats)
+    
+    @cached_property
+    def limits_r(self):
+        """Output of limits_r()"""
+        return limits_r(self.stats)
+
+
+def _as_summary(x, y=None):
+    """
+    Return x if it is already a SubgroupSummary, otherwise build one from x and y
+    """
+    if isinstance(x, SubgroupSummary):
+        return x
+    return SubgroupSummary(x, y)
+
+
+def _merge_stats(parts):
+    """
+    Combine SubgroupStats that may share subgroups, merging each shared subgroup's
+    count, sum, and sum of squared deviations with Chan's parallel formula
+    """
+    if len({p.stream is None for p in parts}) > 1:
+        raise ValueError("cannot merge statistics with streams and without streams")
+    x = np.concatenate([p.x for p in parts])
+    stream = None if parts[0].stream is None else np.concatenate([p.stream for p in parts])
+    nw = np.concatenate([p.nw for p in parts])
+    total = np.concatenate([p.total for p in parts])
+    m2 = np.concatenate([p.m2 for p in parts])
+    ymin = np.concatenate([p.ymin for p in parts])
+    ymax = np.concatenate([p.ymax for p in parts])
+    
+    # Line up copies of the same subgroup
+    codes, uniques, skeys = _subgroup_codes(x, stream)
+    order = np.argsort(codes, kind='stable')
+    codes, nw, total, m2, ymin, ymax = codes[order], nw[order], total[order], m2[order], ymin[order], ymax[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    
+    # Pool each copy's squared deviations around the merged mean
+    merged_nw = np.add.reduceat(nw, starts)
+    merged_total = np.add.reduceat(total, starts)
+    mean = np.repeat(merged_total / merged_nw, np.diff(np.r_[starts, len(codes)]))
+    merged_m2 = np.add.reduceat(m2 + nw * (total / nw - mean)**2, starts)
+    
+    return SubgroupStats(
+        x=np.asarray(uniques),
+        nw=merged_nw,
+        total=merged_total,
+        m2=merged_m2,
+        ymin=np.minimum.reduceat(ymin, starts),
+        ymax=np.maximum.reduceat(ymax, starts),
+        stream=None if stream is None else np.asarray(skeys)
+    )
+
+
+class SubgroupAccumulator:
+    """
+    Mergeable Subgroup Statistics Accumulator
+    
+    Collects per-subgroup count, sum, sum of squared deviations (M2), minimum, and
+    maximum from data that arrives in pieces: in chunks with update(), or as partial
+    results from other workers with merge(). Merging is associative, so shards can be
+    combined in any order. Accumulators travel between processes as bytes with
+    to_bytes() and from_bytes(), and stats() hands the result to get_stat_s(),
+    get_stat_t(), limits_avg(), limits_s(), limits_r(), and the chart functions.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> a = SubgroupAccumulator().update(x=water['time'][:80], y=water['temp'][:80])
+    >>> b = SubgroupAccumulator().update(x=water['time'][80:], y=water['temp'][80:])
+    >>> b = SubgroupAccumulator.from_bytes(b.to_bytes())
+    >>> limits_avg(a.merge(b).stats())
+    """
+    
+    # Arrays saved by to_bytes()
+    _FIELDS = ['x', 'nw', 'total', 'm2', 'ymin', 'ymax', 'stream']
+    
+    def __init__(self):
+        self._stats = None
+    
+    def __repr__(self):
+        if self._stats is None:
+            return "SubgroupAccumulator(subgroups=0, n=0)"
+        return f"SubgroupAccumulator(subgroups={len(self._stats)}, n={self._stats.n})"
+    
+    def _add(self, part):
+        """Fold a SubgroupStats into the running statistics"""
+        if len(part) == 0:
+            return self
+        self._stats = part if self._stats is None else _merge_stats([self._stats, part])
+        return self
+    
+    def update(self, x, y, stream=None):
+        """
+        Add a chunk of raw measurements, and return the accumulator
+        
+        Parameters
+        ----------
+        x : array-like
+            Vector of subgroup values (usually time). Must be same length as y.
+        y : array-like
+            Vector of metric values (e.g., performance). Must be same length as x.
+        stream : array-like, optional
+            Vector of stream keys. Must be same length as x. Default is None.
+        """
+        return self._add(subgroup_stats(x, y, stream=stream))
+    
+    def merge(self, other):
+        """
+        Fold another SubgroupAccumulator (or SubgroupStats) into this one, and return this one
+        """
+        if isinstance(other, SubgroupAccumulator):
+            return self if other._stats is None else self._add(other._stats)
+        return self._add(other)
+    
+    def stats(self):
+        """
+        Return the accumulated SubgroupStats
+        """
+        if self._stats is None:
+            raise ValueError("no measurements have been added to the accumulator")
+        return self._stats
+    
+    @staticmethod
+    def _encode_keys(value):
+        """
+        Encode object keys as a typed array plus the name of their type, so they
+        round-trip exactly without pickle. Supports str, datetime.date, and naive
+        datetime.datetime keys.
+        """
+        import datetime
+        kinds = {type(v) for v in value}
+        if kinds <= {str}:
+            return value.astype(str), 'str'
+        if kinds == {datetime.date}:
+            return value.astype('datetime64[D]'), 'date'
+        if kinds == {datetime.datetime} and all(v.tzinfo is None for v in value):
+            return value.astype('datetime64[us]'), 'datetime'
+        raise ValueError("to_bytes() only supports object keys that are all str, "
+                         "all datetime.date, or all naive datetime.datetime")
+    
+    def to_bytes(self):
+        """
+        Serialize the accumulator to bytes (NumPy .npz format, without pickle)
+        """
+        import io
+        arrays = {}
+        if self._stats is not None:
+            for k in self._FIELDS:
+                value = getattr(self._stats, k)
+                if value is not None:
+                    if value.dtype == object:
+                        # Store object keys with their type, so no pickle is needed
+                        value, kind = self._encode_keys(value)
+                        arrays[k + '_kind'] = np.array(kind)
+                    arrays[k] = value
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        return buffer.getvalue()
+    
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Rebuild an accumulator from the output of to_bytes()
+        """
+        import io
+        accumulator = cls()
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            fields = {k: arrays[k] for k in cls._FIELDS if k in arrays.files}
+            for k in fields:
+                # Restore encoded keys to the object dtype that live accumulators use
+                if k + '_kind' in arrays.files:
+                    fields[k] = fields[k].astype(object)
+            if len(fields) > 0:
+                accumulator._stats = SubgroupStats(**fields)
+        return accumulator
+
+
+def read_subgroups(path, x="time", y="temp", stream=None, chunksize=100000,
+                   accumulator=None, **kwargs):
+    """
+    Read Subgroup Statistics from a CSV File in Chunks
+    
+    Streams a CSV file through pd.read_csv in fixed-size chunks, reading only the
+    needed columns with typed dtypes, and folds each chunk into a SubgroupAccumulator.
+    Memory stays bounded by the chunk size and the number of subgroups, however
+    large the file.
+    
+    Parameters
+    ----------
+    path : str or file-like
+        CSV file to read (anything pd.read_csv accepts).
+    x : str, optional
+        Name of the subgroup column (usually time). Default is "time".
+    y : str or list of str, optional
+        Name of the metric column. Or, several metric columns, in which case each
+        becomes its own stream, named after its column. Default is "temp".
+    stream : str, optional
+        Name of a stream column (e.g. tool or chamber), if any. Default is None.
+    chunksize : int, optional
+        Number of rows read at a time. Default is 100000.
+    accumulator : SubgroupAccumulator, optional
+        An accumulator to add to, e.g. to combine several files. Default is None,
+        which starts a new one.
+    **kwargs
+        Passed on to pd.read_csv (e.g. sep, compression, or dtype for x).
+    
+    Returns
+    -------
+    SubgroupAccumulator
+        The accumulated statistics; call .stats() to pass them to get_stat_s(),
+        limits_avg(), limits_s(), limits_r(), or the chart functions.
+    
+    Examples
+    --------
+    >>> subgroups = read_subgroups("workshops/onsen.csv", x="time", y="temp", chunksize=50)
+    >>> limits_avg(subgroups.stats())
+    >>> 
+    >>> # Several metrics at once, one stream each
+    >>> subgroups = read_subgroups("workshops/onsen.csv", x="time", y=["temp", "ph", "sulfur"])
+    >>> limits_s(subgroups.stats())
+    """
+    columns = [y] if isinstance(y, str) else list(y)
+    if stream is not None and len(columns) > 1:
+        raise ValueError("use either a stream column or several y columns, not both")
+    usecols = [x] + columns + ([] if stream is None else [stream])
+    dtype = {column: 'float64' for column in columns}
+    dtype.update(kwargs.pop('dtype', {}))
+    
+    if accumulator is None:
+        accumulator = SubgroupAccumulator()
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize, **kwargs):
+        if len(columns) > 1:
+            # One stream per metric column
+            values = chunk[columns].to_numpy()
+            accumulator.update(x=np.repeat(chunk[x].to_numpy(), len(columns)), y=values.ravel(),
+                               stream=np.tile(columns, len(chunk)))
+        else:
+            accumulator.update(x=chunk[x], y=chunk[columns[0]],
+                               stream=None if stream is None else chunk[stream])
+    return accumulator
+
+
+def read_arrow(source, x="time", y="temp", stream=None, x_range=None, filters=None,
+               accumulator=None):
+    """
+    Read Subgroup Statistics from a pyarrow Table or Parquet Data
+    
+    Scans a pyarrow Table, or a Parquet file or directory, one record batch at a time,
+    and folds each batch into a SubgroupAccumulator. Only the needed columns are read,
+    and row groups whose statistics rule out x_range or filters are skipped without
+    being read. Column buffers go straight from Arrow to NumPy, without pandas.
+    Needs pyarrow.
+    
+    Parameters
+    ----------
+    source : pyarrow.Table, str, or list of str
+        A pyarrow Table, or the path(s) of Parquet files or a directory of them.
+    x : str, optional
+        Name of the subgroup column (usually time). Default is "time".
+    y : str, optional
+        Name of the metric column. Default is "temp".
+    stream : str, optional
+        Name of a stream column (e.g. tool or chamber), if any. Default is None.
+    x_range : tuple, optional
+        (first, last) subgroup values to keep, inclusive. Default is None (keep all).
+    filters : list or pyarrow.dataset.Expression, optional
+        Further row filters, in the format of pyarrow.parquet.read_table. Default is None.
+    accumulator : SubgroupAccumulator, optional
+        An accumulator to add to. Default is None, which starts a new one.
+    
+    Returns
+    -------
+    SubgroupAccumulator
+        The accumulated statistics; call .stats() to pass them to get_stat_s(),
+        limits_avg(), limits_s(), limits_r(), or the chart functions.
+    
+    Examples
+    --------
+    >>> import pyarrow.parquet as pq
+    >>> table = pq.read_table("onsen.parquet")
+    >>> limits_avg(read_arrow(table, x="time", y="temp").stats())
+    >>> 
+    >>> # Read only subgroups 5 to 11 from disk
+    >>> limits_s(read_arrow("onsen.parquet", x="time", y="temp", x_range=(5, 11)).stats())
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    
+    # Combine the subgroup range with any other filters
+    if filters is not None and not isinstance(filters, ds.Expression):
+        filters = pq.filters_to_expression(filters)
+    if x_range is not None:
+        condition = (ds.field(x) >= x_range[0]) & (ds.field(x) <= x_range[1])
+        filters = condition if filters is None else filters & condition
+    
+    columns = [x, y] + ([] if stream is None else [stream])
+    dataset = ds.dataset(source) if isinstance(source, pa.Table) else ds.dataset(source, format="parquet")
+    
+    if accumulator is None:
+        accumulator = SubgroupAccumulator()
+    for batch in dataset.to_batches(columns=columns, filter=filters):
+        if batch.num_rows == 0:
+            continue
+        accumulator.update(x=batch.column(x), y=batch.column(y),
+                           stream=None if stream is None else batch.column(stream))
+    return accumulator
+
+
+class MeasurementStore:
+    """
+    Memory-Mapped Measurement Store
+    
+    An on-disk, columnar store for long measurement histories: one binary file per
+    column (subgroup id, value, and optional timestamp) in a directory, read back with
+    np.memmap so only the pages a calculation touches are loaded. New readings are
+    added with append(), and an index of where each run of rows for a subgroup starts
+    lets stats() and read() go straight to the subgroups asked for.
+    
+    Pass a store in place of x to get_stat_s(), get_stat_t(), limits_avg(), limits_s(),
+    limits_r(), limits_mr(), or the chart functions.
+    
+    Parameters
+    ----------
+    path : str
+        Directory of the store. Created if it does not exist.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> store = MeasurementStore("onsen_store")
+    >>> store.append(subgroup=water['time'], value=water['temp'])
+    >>> limits_avg(store)
+    >>> limits_s(store.stats(first=5, last=11))
+    """
+    
+    # On-disk type of each column, and of each index entry
+    _DTYPES = {'subgroup': np.int64, 'value': np.float64}
+    _RUN = np.dtype([('subgroup', np.int64), ('start', np.int64), ('count', np.int64)])
+    
+    def __init__(self, path):
+        import json
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta = os.path.join(path, 'meta.json')
+        if os.path.exists(meta):
+            with open(meta) as f:
+                self._meta = json.load(f)
+        else:
+            self._meta = {'rows': 0, 'runs': 0, 'timestamp': None}
+        self._maps = {}
+    
+    def __len__(self):
+        return self._meta['rows']
+    
+    def __repr__(self):
+        return f"MeasurementStore(path={self.path!r}, rows={len(self)}, runs={self._meta['runs']})"
+    
+    def _file(self, name):
+        return os.path.join(self.path, name + '.bin')
+    
+    def _map(self, name, dtype, length):
+        """Read-only memory map of a column file, reused until the next append"""
+        if name not in self._maps:
+            if length == 0:
+                self._maps[name] = np.zeros(0, dtype=dtype)
+            else:
+                self._maps[name] = np.memmap(self._file(name), dtype=dtype, mode='r', shape=(length,))
+        return self._maps[name]
+    
+    @property
+    def subgroup(self):
+        """Subgroup id of every row, memory-mapped"""
+        return self._map('subgroup', self._DTYPES['subgroup'], len(self))
+    
+    @property
+    def value(self):
+        """Value of every row, memory-mapped"""
+        return self._map('value', self._DTYPES['value'], len(self))
+    
+    @property
+    def timestamp(self):
+        """Timestamp of every row, memory-mapped (None if the store has no timestamps)"""
+        if self._meta['timestamp'] is None:
+            return None
+        return self._map('timestamp', np.dtype(self._meta['timestamp']), len(self))
+    
+    @property
+    def runs(self):
+        """Index of runs of rows: the subgroup, first row, and number of rows of each run"""
+        if 'runs' not in self._maps and self._meta['runs'] > 0 and 'last_count' in self._meta:
+            # The last run's committed length lives in meta.json, since appends extend it
+            runs = np.memmap(self._file('runs'), dtype=self._RUN, mode='c', shape=(self._meta['runs'],))
+            runs['count'][-1] = self._meta['last_count']
+            self._maps['runs'] = runs
+        return self._map('runs', self._RUN, self._meta['runs'])
+    
+    def append(self, subgroup, value, timestamp=None):
+        """
+        Append readings to the end of the store, and return the store
+        
+        Parameters
+        ----------
+        subgroup : array-like
+            Integer subgroup id of each reading (e.g. hour or batch number)
+        value : array-like
+            Value of each reading. Must be same length as subgroup.
+        timestamp : array-like, optional
+            Time of each reading (e.g. datetime64). Must be given for every append
+            if it was given for the first one, and never otherwise.
+        """
+        import json
+        ids = _as_array(subgroup)
+        with np.errstate(invalid='ignore'):
+            subgroup = ids.astype(self._DTYPES['subgroup'])
+        # Refuse ids the cast would change (e.g. 1.5 and 1.9 both becoming 1)
+        if ids.dtype.kind not in 'iub' and np.any(subgroup != ids):
+            raise ValueError("subgroup ids must be integers")
+        value = _as_array(value, dtype=self._DTYPES['value'])
+        columns = {'subgroup': subgroup, 'value': value}
+        # The first append decides whether the store has timestamps
+        stamp = self._meta['timestamp']
+        if len(self) == 0:
+            stamp = None if timestamp is None else _as_array(timestamp).dtype.str
+        if (timestamp is None) != (stamp is None):
+            raise ValueError("give timestamps for every append, or for none")
+        if timestamp is not None:
+            columns['timestamp'] = _as_array(timestamp).astype(stamp)
+        if any(len(v) != len(subgroup) for v in columns.values()):
+            raise ValueError("subgroup, value, and timestamp must be the same length")
+        if len(subgroup) == 0:
+            return self
+        
+        # Runs of rows with the same subgroup in this chunk
+        starts = np.flatnonzero(np.r_[True, subgroup[1:] != subgroup[:-1]])
+        runs = np.zeros(len(starts), dtype=self._RUN)
+        runs['subgroup'] = subgroup[starts]
+        runs['start'] = starts + len(self)
+        runs['count'] = np.diff(np.r_[starts, len(subgroup)])
+        
+        # Extend the last run if the chunk continues it. The length of the last run
+        # is read from meta.json, so changing it on disk is invisible until commit.
+        nruns = self._meta['runs']
+        last = self.runs[-1].copy() if nruns > 0 else None
+        self._maps = {}
+        if last is not None and last['subgroup'] == runs['subgroup'][0]:
+            last['count'] += runs['count'][0]
+            runs = runs[1:]
+        if last is not None and len(runs) > 0:
+            # New runs will follow it, so its length must now be right in the index
+            entry = np.memmap(self._file('runs'), dtype=self._RUN, mode='r+', shape=(1,),
+                              offset=(nruns - 1) * self._RUN.itemsize)
+            entry['count'][0] = last['count']
+            entry.flush()
+            del entry
+        last_count = int(runs['count'][-1] if len(runs) > 0 else last['count'])
+        
+        # Write each file from its committed end, dropping any bytes left behind by an
+        # append that was interrupted before it committed
+        files = dict(columns, runs=runs)
+        lengths = dict.fromkeys(columns, len(self))
+        lengths['runs'] = nruns
+        for name, column in files.items():
+            with open(self._file(name), 'a+b') as f:
+                f.truncate(lengths[name] * column.dtype.itemsize)
+                column.tofile(f)
+                # Data must reach the disk before meta.json points at it
+                f.flush()
+                os.fsync(f.fileno())
+        
+        # Commit by atomically replacing meta.json, so readers never see a partial append
+        meta = dict(self._meta, rows=len(self) + len(subgroup), runs=nruns + len(runs),
+                    last_count=last_count, timestamp=stamp)
+        temp = os.path.join(self.path, 'meta.json.tmp')
+        with open(temp, 'w') as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, os.path.join(self.path, 'meta.json'))
+        if os.name != 'nt':
+            # Make the rename itself durable (directories cannot be opened on Windows)
+            directory = os.open(self.path, os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+        self._meta = meta
+        return self
+    
+    def rows(self, first=None, last=None):
+        """
+        Return the rows holding subgroups first to last (inclusive), as a slice when
+        they are contiguous on disk, or else as an array of row numbers
+        """
+        runs = self.runs
+        keep = np.ones(len(runs), dtype=bool)
+        if first is not None:
+            keep &= runs['subgroup'] >= first
+        if last is not None:
+            keep &= runs['subgroup'] <= last
+        runs = runs[keep]
+        if len(runs) == 0:
+            return slice(0, 0)
+        ends = runs['start'] + runs['count']
+        if np.all(runs['start'][1:] == ends[:-1]):
+            return slice(int(runs['start'][0]), int(ends[-1]))
+        return np.concatenate([np.arange(a, b) for a, b in zip(runs['start'], ends)])
+    
+    def read(self, first=None, last=None):
+        """
+        Return the subgroup, value, and timestamp arrays for subgroups first to last
+        (inclusive). Contiguous rows come back as memory-mapped views, not copies.
+        """
+        rows = self.rows(first, last)
+        timestamp = self.timestamp
+        return (self.subgroup[rows], self.value[rows],
+                None if timestamp is None else timestamp[rows])
+    
+    def stats(self, first=None, last=None):
+        """
+        Return the SubgroupStats of subgroups first to last (inclusive)
+        """
+        subgroup, value, _ = self.read(first, last)
+        return subgroup_stats(subgroup, value)
+
+
+def get_stat_s(x, y=None, stream=None):
     """
     Get Subgroup Statistics
     
@@ -147,10 +1086,17 @@ def get_stat_s(x, y):
     
     Parameters
     ----------
-    x : array-like
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
         Vector of subgroup values (usually time). Must be same length as y.
-    y : array-like
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
         Vector of metric values (e.g., performance). Must be same length as x.
+    stream : array-like, optional
+        Vector of stream keys (e.g. tool, chamber, or metric). Must be same length as x.
+        If given, statistics are computed separately for each stream and returned
+        in long format, with a leading stream column. Default is None.
     
     Returns
     -------
@@ -164,30 +1110,28 @@ def get_stat_s(x, y):
     >>> water = pd.read_csv("workshops/onsen.csv")
     >>> get_stat_s(x=water['time'], y=water['temp'])
     """
-    # Make a data.frame
-    data = pd.DataFrame({'x': pd.Series(x), 'y': pd.Series(y)})
+    # Reuse cached results from a SubgroupSummary
+    if isinstance(x, SubgroupSummary):
+        return x.stat_s.copy()
     
-    # Calculate sigma_t direct
-    sigma_t = data['y'].std()
+    # Get sufficient statistics for each subgroup
+    data = _as_stats(x, y, stream)
     
     # Calculate statistics for each subgroup
-    stat_s = (data.groupby('x')
-              .agg({
-                  'y': ['mean', 'min', 'max', 'std', 'count']
-              })
-              .reset_index())
-    
-    # Flatten column names
-    stat_s.columns = ['x', 'xbar', 'y_min', 'y_max', 's', 'nw']
-    stat_s['r'] = stat_s['y_max'] - stat_s['y_min']
-    stat_s['df'] = stat_s['nw'] - 1
-    stat_s = stat_s[['x', 'xbar', 'r', 's', 'nw', 'df']]
-    
-    # Calculate between-group estimates
-    stat_s['xbbar'] = stat_s['xbar'].mean()
+    stat_s = _with_stream(pd.DataFrame({
+        'x': data.x,
+        'xbar': data.xbar,
+        'r': data.r,
+        's': data.s,
+        'nw': data.nw,
+        'df': data.df
+    }), data)
+    
+    # Calculate between-group estimates (per stream, if any)
+    stat_s['xbbar'] = data.per_subgroup(data.stream_mean(data.xbar))
     # Calculate sigma_s (pooled standard deviation)
-    stat_s['sigma_s'] = np.sqrt((stat_s['df'] * stat_s['s']**2).sum() / stat_s['df'].sum())
-    stat_s['sigma_t'] = sigma_t
+    stat_s['sigma_s'] = data.per_subgroup(data.stream_sigma_s())
+    stat_s['sigma_t'] = data.per_subgroup(data.stream_sigma_t())
     stat_s['se'] = stat_s['sigma_s'] / np.sqrt(stat_s['nw'])
     stat_s['upper'] = stat_s['xbbar'] + 3 * stat_s['se']
     stat_s['lower'] = stat_s['xbbar'] - 3 * stat_s['se']
@@ -195,7 +1139,7 @@ def get_stat_s(x, y):
     return stat_s
 
 
-def get_stat_t(x, y):
+def get_stat_t(x, y=None, stream=None):
     """
     Get Total Statistics
     
@@ -203,10 +1147,17 @@ def get_stat_t(x, y):
     
     Parameters
     ----------
-    x : array-like
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
         Vector of subgroup values (usually time). Must be same length as y.
-    y : array-like
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
         Vector of metric values (e.g., performance). Must be same length as x.
+    stream : array-like, optional
+        Vector of stream keys (e.g. tool, chamber, or metric). Must be same length as x.
+        If given, statistics are computed separately for each stream and returned
+        in long format, with a leading stream column. Default is None.
     
     Returns
     -------
@@ -220,38 +1171,31 @@ def get_stat_t(x, y):
     >>> water = pd.read_csv("workshops/onsen.csv")
     >>> get_stat_t(x=water['time'], y=water['temp'])
     """
-    # Make a data.frame
-    data = pd.DataFrame({'x': pd.Series(x), 'y': pd.Series(y)})
-    
-    # Get total standard deviation
-    sigma_t = data['y'].std()
-    
-    # Get statistics for each subgroup
-    stat_s = (data.groupby('x')
-              .agg({
-                  'y': ['mean', 'min', 'max', 'std', 'count']
-              })
-              .reset_index())
+    # Reuse cached results from a SubgroupSummary
+    if isinstance(x, SubgroupSummary):
+        return x.stat_t.copy()
     
-    stat_s.columns = ['x', 'xbar', 'y_min', 'y_max', 's', 'nw']
-    stat_s['r'] = stat_s['y_max'] - stat_s['y_min']
-    stat_s['df'] = stat_s['nw'] - 1
+    # Get sufficient statistics for each subgroup
+    data = _as_stats(x, y, stream)
+    s = data.s
     
-    # Now calculate one row of total statistics
+    # Now calculate one row of total statistics (per stream, if any)
     output = pd.DataFrame({
         # average average
-        'xbbar': [stat_s['xbar'].mean()],
+        'xbbar': data.stream_mean(data.xbar),
         # average range
-        'rbar': [stat_s['r'].mean()],
+        'rbar': data.stream_mean(data.r),
         # average standard deviation
-        'sbar': [stat_s['s'].mean()],
+        'sbar': data.stream_mean(s),
         # average within-group standard deviation
-        'sigma_s': [np.sqrt((stat_s['s']**2 * stat_s['nw']).sum() / stat_s['nw'].sum())],
+        'sigma_s': np.sqrt(data.stream_sum(np.nan_to_num(s**2 * data.nw)) / data.stream_sum(data.nw)),
         # overall standard deviation
-        'sigma_t': [sigma_t],
+        'sigma_t': data.stream_sigma_t(),
         # total sample size
-        'n': [stat_s['nw'].sum()]
+        'n': data.stream_sum(data.nw)
     })
+    if data.stream is not None:
+        output.insert(0, 'stream', data.stream_keys())
     
     return output
 
@@ -317,68 +1261,277 @@ def rnorm(n, mean=0, sd=1):
     return output
 
 
-def dn(n, reps=10000):
+# Cache of exact control constants, keyed by subgroup size n
+_CONSTANTS = {}
+
+# Gauss-Legendre nodes and weights, reused for every numerical integral below
+_GL_NODES, _GL_WEIGHTS = np.polynomial.legendre.leggauss(256)
+
+
+def _gauss_legendre(a, b):
     """
-    Calculate control constants for range charts
+    Rescale the Gauss-Legendre nodes and weights onto the interval [a, b]
+    """
+    half = (b - a) / 2
+    return half * _GL_NODES + (a + b) / 2, half * _GL_WEIGHTS
+
+
+def _exact_constants(n):
+    """
+    Compute exact control constants for a single subgroup size n
     
-    Simulates ranges from normal distributions to calculate d2, d3, D3, and D4 constants
-    used in range control charts.
+    Integrates the distribution of the range and standard deviation of n
+    standard normal values, instead of simulating them.
     
     Parameters
     ----------
     n : int
         Subgroup size
-    reps : int, optional
-        Number of simulation replicates. Default is 10000.
+    
+    Returns
+    -------
+    dict
+        Dictionary with keys: n, d2, d3, c4, b3, A3, B3, B4, D3, D4
+    """
+    n = int(n)
+    keys = ['d2', 'd3', 'c4', 'b3', 'A3', 'B3', 'B4', 'D3', 'D4']
+    # Constants are undefined for a subgroup of 1
+    if n < 2:
+        return dict({'n': n}, **{k: np.nan for k in keys})
+    
+    # Expected range: d2 = integral of 1 - F(x)^n - (1 - F(x))^n
+    x, wx = _gauss_legendre(-10, 10)
+    d2 = np.sum(wx * (1 - stats.norm.sf(x)**n - stats.norm.cdf(x)**n))
+    
+    # Second moment of the range, integrating over the maximum x and the range w
+    w, ww = _gauss_legendre(0, 20)
+    hi = x[:, None]
+    lo = hi - w[None, :]
+    g = (1 - stats.norm.cdf(hi)**n - stats.norm.sf(lo)**n +
+         (stats.norm.cdf(hi) - stats.norm.cdf(lo))**n)
+    r2 = 2 * np.sum(wx[:, None] * ww[None, :] * g)
+    # standard deviation of ranges
+    d3 = np.sqrt(r2 - d2**2)
+    
+    # Expected standard deviation has a closed form in gamma functions
+    c4 = np.sqrt(2 / (n - 1)) * np.exp(special.gammaln(n / 2) - special.gammaln((n - 1) / 2))
+    # standard deviation of standard deviations
+    b3 = np.sqrt(1 - c4**2)
+    
+    return {
+        'n': n, 'd2': d2, 'd3': d3, 'c4': c4, 'b3': b3,
+        'A3': 3 / (c4 * np.sqrt(n)),
+        # Lower constants can go negative; we need to bound them at zero
+        'B3': max(1 - 3 * b3 / c4, 0.0),
+        'B4': 1 + 3 * b3 / c4,
+        'D3': max(1 - 3 * d3 / d2, 0.0),
+        'D4': 1 + 3 * d3 / d2
+    }
+
+
+def _constant(n):
+    """
+    Look up the exact control constants for subgroup size n, computing them once
+    """
+    n = int(n)
+    if n not in _CONSTANTS:
+        _CONSTANTS[n] = _exact_constants(n)
+    return _CONSTANTS[n]
+
+
+def _lookup_constants(nw, name):
+    """
+    Look up one control constant for every value in a vector of subgroup sizes
+    """
+    sizes, inverse = np.unique(np.asarray(nw, dtype=int), return_inverse=True)
+    values = np.array([_constant(k)[name] for k in sizes], dtype=float)
+    return values[inverse]
+
+
+def control_constants(n, path=None):
+    """
+    Get Exact Control Constants
+    
+    Returns exact control constants d2, d3, c4, A3, B3, B4, D3 and D4 for one or more
+    subgroup sizes, using numerical integration of the normal distribution rather
+    than simulation. Results are memoized per subgroup size, so repeated lookups are
+    instant and always give the same limits.
+    
+    Parameters
+    ----------
+    n : int or array-like
+        Subgroup size(s)
+    path : str, optional
+        Path to a CSV of saved constants (e.g. "workshops/constants.csv"). If given,
+        constants already in the file are loaded instead of recomputed, and any newly
+        computed constants are written back to it. Default is None (memory only).
     
     Returns
     -------
     pd.DataFrame
-        DataFrame with columns: d2, d3, D3, D4
+        DataFrame with columns: n, d2, d3, c4, b3, A3, B3, B4, D3, D4
+        One row per value of n.
     
     Examples
     --------
-    >>> dn(n=12)
+    >>> control_constants(n=5)
+    >>> control_constants(n=range(2, 26), path="workshops/constants.csv")
+    """
+    n = [int(k) for k in np.atleast_1d(np.asarray(n))]
+    
+    # Load any saved constants we have not computed yet
+    if path is not None and os.path.exists(path):
+        saved = pd.read_csv(path)
+        for row in saved.to_dict('records'):
+            row['n'] = int(row['n'])
+            _CONSTANTS.setdefault(row['n'], row)
+    
+    missing = [k for k in set(n) if k not in _CONSTANTS]
+    output = pd.DataFrame([_constant(k) for k in n])
+    
+    # Save the cache if it gained new subgroup sizes
+    if path is not None and (missing or not os.path.exists(path)):
+        table = pd.DataFrame([_CONSTANTS[k] for k in sorted(_CONSTANTS)])
+        table.to_csv(path, index=False)
+    
+    return output
+
+
+def simulate_constants(n, reps=10000, dist=None, seed=None, chunk_cells=2**22):
     """
-    sims = pd.DataFrame({'rep': pd.Series(range(reps)) + 1, 'n': n})
+    Simulate Control Constants
+    
+    Estimates control constants by simulating reps subgroups of size n from any
+    parent distribution. Draws are made as a reps x n matrix from a NumPy random
+    Generator, in chunks of at most chunk_cells values, and reduced row-wise to
+    ranges and standard deviations. Values are scaled by the standard deviation
+    of the parent distribution, so a normal parent matches control_constants().
     
-    # For each replicate, simulate the ranges of n values
-    def calc_range(g):
-        r = rnorm(n=int(g['n'].iloc[0]), mean=0, sd=1)
-        return pd.Series({'r': r.max() - r.min()})
+    Parameters
+    ----------
+    n : int
+        Subgroup size
+    reps : int, optional
+        Number of simulated subgroups. Default is 10000.
+    dist : scipy.stats frozen distribution, optional
+        Parent distribution to draw from, e.g. stats.expon() or stats.gamma(a=2).
+        Default is None, which uses the standard normal distribution.
+    seed : int or np.random.Generator, optional
+        Seed for reproducible simulations. Default is None.
+    chunk_cells : int, optional
+        Maximum number of values drawn at once, which bounds memory use. Default is 2**22.
     
-    sims = sims.groupby('rep').apply(calc_range).reset_index(drop=True)
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: n, d2, d3, c4, b3, A3, B3, B4, D3, D4
+        One row.
     
-    # Calculate statistics
-    stats_df = pd.DataFrame({
-        # mean range
-        'd2': [sims['r'].mean()],
-        # standard deviation of ranges
-        'd3': [sims['r'].std()]
+    Examples
+    --------
+    >>> from scipy import stats
+    >>> simulate_constants(n=5, reps=1000000, seed=1)
+    >>> simulate_constants(n=5, reps=100000, dist=stats.expon(), seed=1)
+    """
+    n = int(n)
+    dist = stats.norm() if dist is None else dist
+    rng = np.random.default_rng(seed)
+    scale = dist.std()
+    chunk = max(1, chunk_cells // n)
+    
+    # Running totals of r, r^2, s, and s^2 across chunks
+    totals = np.zeros(4)
+    done = 0
+    while done < reps:
+        size = min(chunk, reps - done)
+        draws = dist.rvs(size=(size, n), random_state=rng) / scale
+        r = draws.max(axis=1) - draws.min(axis=1)
+        s = draws.std(axis=1, ddof=1)
+        totals += [r.sum(), (r**2).sum(), s.sum(), (s**2).sum()]
+        done += size
+    
+    # mean and standard deviation of ranges
+    d2 = totals[0] / reps
+    d3 = np.sqrt((totals[1] - reps * d2**2) / (reps - 1))
+    # mean and standard deviation of standard deviations
+    c4 = totals[2] / reps
+    b3 = np.sqrt((totals[3] - reps * c4**2) / (reps - 1))
+    
+    return pd.DataFrame({
+        'n': [n], 'd2': [d2], 'd3': [d3], 'c4': [c4], 'b3': [b3],
+        'A3': [3 / (c4 * np.sqrt(n))],
+        # Lower constants can go negative; we need to bound them at zero
+        'B3': [max(1 - 3 * b3 / c4, 0.0)],
+        'B4': [1 + 3 * b3 / c4],
+        'D3': [max(1 - 3 * d3 / d2, 0.0)],
+        'D4': [1 + 3 * d3 / d2]
     })
+
+
+def dn(n, reps=10000, method="exact", dist=None, seed=None):
+    """
+    Calculate control constants for range charts
+    
+    Calculates the d2, d3, D3, and D4 constants used in range control charts,
+    either exactly (by numerical integration) or by simulating ranges from
+    a normal (or other) parent distribution with simulate_constants().
+    
+    Parameters
+    ----------
+    n : int
+        Subgroup size
+    reps : int, optional
+        Number of simulation replicates, used when method="simulate". Default is 10000.
+    method : str, optional
+        One of "exact" or "simulate". Default is "exact".
+    dist : scipy.stats frozen distribution, optional
+        Parent distribution used when method="simulate". Default is None (standard normal).
+    seed : int, optional
+        Seed used when method="simulate". Default is None.
+    
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: d2, d3, D3, D4
+    
+    Examples
+    --------
+    >>> dn(n=12)
+    >>> dn(n=12, reps=10000, method="simulate", seed=1)
+    """
+    if method not in ["exact", "simulate"]:
+        raise ValueError("method must be one of: exact, simulate")
     
-    # and constants for obtaining lower and upper ci for rbar
-    stats_df['D3'] = 1 - 3 * stats_df['d3'] / stats_df['d2']
-    stats_df['D4'] = 1 + 3 * stats_df['d3'] / stats_df['d2']
-    # Sometimes D3 goes negative; we need to bound it at zero
-    stats_df.loc[stats_df['D3'] < 0, 'D3'] = 0
+    if method == "exact":
+        constants = _constant(n)
+        return pd.DataFrame({k: [constants[k]] for k in ['d2', 'd3', 'D3', 'D4']})
     
-    return stats_df
+    # Otherwise, simulate ranges from the parent distribution
+    sims = simulate_constants(n=n, reps=reps, dist=dist, seed=seed)
+    return sims[['d2', 'd3', 'D3', 'D4']]
 
 
-def bn(n, reps=10000):
+def bn(n, reps=10000, method="exact", dist=None, seed=None):
     """
     Calculate control constants for standard deviation charts
     
-    Simulates standard deviations from normal distributions to calculate b2, b3, C4, A3,
-    B3, and B4 constants used in standard deviation control charts.
+    Calculates the b2, b3, C4, A3, B3, and B4 constants used in standard deviation
+    control charts, either exactly (by numerical integration) or by simulating
+    standard deviations from a normal (or other) parent distribution with
+    simulate_constants().
     
     Parameters
     ----------
     n : int
         Subgroup size
     reps : int, optional
-        Number of simulation replicates. Default is 10000.
+        Number of simulation replicates, used when method="simulate". Default is 10000.
+    method : str, optional
+        One of "exact" or "simulate". Default is "exact".
+    dist : scipy.stats frozen distribution, optional
+        Parent distribution used when method="simulate". Default is None (standard normal).
+    seed : int, optional
+        Seed used when method="simulate". Default is None.
     
     Returns
     -------
@@ -394,35 +1547,63 @@ def bn(n, reps=10000):
     >>> # Upper control limit
     >>> sbar * stat['B4'].iloc[0]
     """
-    sims = pd.DataFrame({'rep': pd.Series(range(reps)) + 1, 'n': n})
-    
-    # For each replicate, simulate the standard deviations of n values
-    def calc_sd(g):
-        s = rnorm(n=int(g['n'].iloc[0]), mean=0, sd=1)
-        return pd.Series({'s': s.std()})
-    
-    sims = sims.groupby('rep').apply(calc_sd).reset_index(drop=True)
+    if method not in ["exact", "simulate"]:
+        raise ValueError("method must be one of: exact, simulate")
+    
+    if method == "exact":
+        constants = _constant(n)
+        return pd.DataFrame({
+            'b2': [constants['c4']],
+            'b3': [constants['b3']],
+            'C4': [constants['c4']],
+            'A3': [constants['A3']],
+            'B3': [constants['B3']],
+            'B4': [constants['B4']]
+        })
     
-    # Calculate statistics
-    stats_df = pd.DataFrame({
-        # mean standard deviation
-        'b2': [sims['s'].mean()],
-        # standard deviation of standard deviations
-        'b3': [sims['s'].std()]
+    # Otherwise, simulate standard deviations from the parent distribution
+    sims = simulate_constants(n=n, reps=reps, dist=dist, seed=seed)
+    return pd.DataFrame({
+        'b2': sims['c4'],
+        'b3': sims['b3'],
+        'C4': sims['c4'],
+        'A3': sims['A3'],
+        'B3': sims['B3'],
+        'B4': sims['B4']
     })
+
+
+class ChartArrays:
+    """
+    Compact Control Chart Results
+    
+    What limits_avg(), limits_s(), limits_r(), and limits_mr() return with
+    as_arrays=True: per-subgroup NumPy arrays (x, the charted statistic, lower,
+    and upper), plus each center line and sigma once as a scalar instead of
+    a column repeated on every row. With streams, the center lines hold one
+    value per stream, in the order of stream.
+    """
     
-    stats_df['C4'] = stats_df['b2']  # sometimes called C4
-    stats_df['A3'] = 3 / (stats_df['b2'] * np.sqrt(n))
-    # and constants for obtaining lower and upper ci
-    stats_df['B3'] = 1 - 3 * stats_df['b3'] / stats_df['b2']
-    stats_df['B4'] = 1 + 3 * stats_df['b3'] / stats_df['b2']
-    # Sometimes B3 goes negative; we need to bound it at zero
-    stats_df.loc[stats_df['B3'] < 0, 'B3'] = 0
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
     
-    return stats_df
+    def __repr__(self):
+        return f"ChartArrays({', '.join(self.__dict__)})"
 
 
-def limits_avg(x, y):
+def _chart_arrays(data, subgroups, centers):
+    """
+    Package per-subgroup arrays and per-stream center lines as ChartArrays,
+    unwrapping center lines to scalars when there are no streams
+    """
+    if data.stream is None:
+        centers = {k: float(v[0]) if len(v) else np.nan for k, v in centers.items()}
+    else:
+        centers['stream'] = data.stream_keys()
+    return ChartArrays(x=data.x, **subgroups, **centers)
+
+
+def limits_avg(x, y=None, stream=None, as_arrays=False):
     """
     Get Upper and Lower Control Limits for an Averages Chart, using Control Constants
     
@@ -430,50 +1611,59 @@ def limits_avg(x, y):
     
     Parameters
     ----------
-    x : array-like
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
         Vector of subgroup values (usually time). Must be same length as y.
-    y : array-like
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
         Vector of metric values (e.g., performance). Must be same length as x.
+    stream : array-like, optional
+        Vector of stream keys (e.g. tool, chamber, or metric). Must be same length as x.
+        If given, statistics are computed separately for each stream and returned
+        in long format, with a leading stream column. Default is None.
+    as_arrays : bool, optional
+        If True, return a ChartArrays of NumPy arrays instead, for speed in tight
+        loops. Default is False.
     
     Returns
     -------
     pd.DataFrame
         DataFrame with subgroup statistics and control limits (upper, lower)
         One row per subgroup.
+        Or, with as_arrays=True, a ChartArrays with x, xbar, nw, lower, upper, xbbar, and sbar.
     
     Examples
     --------
     >>> import pandas as pd
     >>> water = pd.read_csv("workshops/onsen.csv")
     >>> limits_avg(x=water['time'], y=water['temp'])
+    >>> # Limits for every metric at once, one stream per metric
+    >>> metrics = water.melt(id_vars=['id', 'time'], value_vars=['temp', 'ph', 'sulfur'])
+    >>> limits_avg(x=metrics['time'], y=metrics['value'], stream=metrics['variable'])
     """
-    # Make a data.frame
-    data = pd.DataFrame({'x': pd.Series(x), 'y': pd.Series(y)})
+    # Reuse cached results from a SubgroupSummary
+    if isinstance(x, SubgroupSummary) and not as_arrays:
+        return x.limits_avg.copy()
     
     # Get within-group stats
-    stat_s = (data.groupby('x')
-              .agg({
-                  'y': ['mean', 'std', 'count']
-              })
-              .reset_index())
-    
-    stat_s.columns = ['x', 'xbar', 's', 'nw']
-    stat_s['df'] = stat_s['nw'] - 1
-    
-    # For each different subgroup sample size, calculate control constant A3
-    constants = (stat_s[['nw']]
-                 .drop_duplicates()
-                 .apply(lambda row: pd.Series({
-                     'A3': bn(n=int(row['nw']), reps=10000)['A3'].iloc[0]
-                 }), axis=1))
-    constants['nw'] = stat_s[['nw']].drop_duplicates()['nw'].values
-    
-    # Join in the control constants
-    stat_s = stat_s.merge(constants, on='nw', how='left')
-    
-    # Add in sbar and xbbar
-    stat_s['sbar'] = np.sqrt((stat_s['df'] * stat_s['s']**2).sum() / stat_s['df'].sum())
-    stat_s['xbbar'] = stat_s['xbar'].mean()
+    data = _as_stats(x, y, stream)
+    if as_arrays:
+        xbbar, sbar = data.stream_mean(data.xbar), data.stream_sigma_s()
+        spread = _lookup_constants(data.nw, 'A3') * data.per_subgroup(sbar)
+        center = data.per_subgroup(xbbar)
+        return _chart_arrays(data, {'xbar': data.xbar, 'nw': data.nw,
+                                    'lower': center - spread, 'upper': center + spread},
+                             {'xbbar': xbbar, 'sbar': sbar})
+    stat_s = _with_stream(pd.DataFrame({'x': data.x, 'xbar': data.xbar, 's': data.s,
+                                        'nw': data.nw, 'df': data.df}), data)
+    
+    # For each subgroup sample size, look up control constant A3
+    stat_s['A3'] = _lookup_constants(stat_s['nw'], 'A3')
+    
+    # Add in sbar and xbbar (per stream, if any)
+    stat_s['sbar'] = data.per_subgroup(data.stream_sigma_s())
+    stat_s['xbbar'] = data.per_subgroup(data.stream_mean(data.xbar))
     
     # Calculate upper and lower control limits
     stat_s['lower'] = stat_s['xbbar'] - stat_s['A3'] * stat_s['sbar']
@@ -482,7 +1672,7 @@ def limits_avg(x, y):
     return stat_s
 
 
-def limits_s(x, y):
+def limits_s(x, y=None, stream=None, as_arrays=False):
     """
     Get Upper and Lower Control Limits for a Standard Deviation Chart, using Control Constants
     
@@ -490,16 +1680,27 @@ def limits_s(x, y):
     
     Parameters
     ----------
-    x : array-like
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
         Vector of subgroup values (usually time). Must be same length as y.
-    y : array-like
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
         Vector of metric values (e.g., performance). Must be same length as x.
+    stream : array-like, optional
+        Vector of stream keys (e.g. tool, chamber, or metric). Must be same length as x.
+        If given, statistics are computed separately for each stream and returned
+        in long format, with a leading stream column. Default is None.
+    as_arrays : bool, optional
+        If True, return a ChartArrays of NumPy arrays instead, for speed in tight
+        loops. Default is False.
     
     Returns
     -------
     pd.DataFrame
         DataFrame with subgroup statistics and control limits (upper, lower)
         One row per subgroup.
+        Or, with as_arrays=True, a ChartArrays with x, s, nw, lower, upper, and sbar.
     
     Examples
     --------
@@ -507,35 +1708,28 @@ def limits_s(x, y):
     >>> water = pd.read_csv("workshops/onsen.csv")
     >>> limits_s(x=water['time'], y=water['temp'])
     """
-    # Make a data.frame
-    data = pd.DataFrame({'x': pd.Series(x), 'y': pd.Series(y)})
+    # Reuse cached results from a SubgroupSummary
+    if isinstance(x, SubgroupSummary) and not as_arrays:
+        return x.limits_s.copy()
     
     # Get within-group stats
-    stat_s = (data.groupby('x')
-              .agg({
-                  'y': ['std', 'count']
-              })
-              .reset_index())
-    
-    stat_s.columns = ['x', 's', 'nw']
-    stat_s['df'] = stat_s['nw'] - 1
-    
-    # For each different subgroup sample size, calculate control constants
-    constants_list = []
-    for nw in stat_s['nw'].unique():
-        bn_stats = bn(n=int(nw), reps=10000)
-        constants_list.append({
-            'nw': nw,
-            'B3': bn_stats['B3'].iloc[0],
-            'B4': bn_stats['B4'].iloc[0]
-        })
-    constants = pd.DataFrame(constants_list)
-    
-    # Join in the control constants
-    stat_s = stat_s.merge(constants, on='nw', how='left')
-    
-    # Add in sbar
-    stat_s['sbar'] = np.sqrt((stat_s['df'] * stat_s['s']**2).sum() / stat_s['df'].sum())
+    data = _as_stats(x, y, stream)
+    if as_arrays:
+        sbar = data.stream_sigma_s()
+        center = data.per_subgroup(sbar)
+        return _chart_arrays(data, {'s': data.s, 'nw': data.nw,
+                                    'lower': _lookup_constants(data.nw, 'B3') * center,
+                                    'upper': _lookup_constants(data.nw, 'B4') * center},
+                             {'sbar': sbar})
+    stat_s = _with_stream(pd.DataFrame({'x': data.x, 's': data.s, 'nw': data.nw,
+                                        'df': data.df}), data)
+    
+    # For each subgroup sample size, look up control constants
+    stat_s['B3'] = _lookup_constants(stat_s['nw'], 'B3')
+    stat_s['B4'] = _lookup_constants(stat_s['nw'], 'B4')
+    
+    # Add in sbar (per stream, if any)
+    stat_s['sbar'] = data.per_subgroup(data.stream_sigma_s())
     
     # Calculate upper and lower control limits
     stat_s['lower'] = stat_s['B3'] * stat_s['sbar']
@@ -544,7 +1738,7 @@ def limits_s(x, y):
     return stat_s
 
 
-def limits_r(x, y):
+def limits_r(x, y=None, stream=None, as_arrays=False):
     """
     Get Upper and Lower Control Limits for a Range Chart, using Control Constants
     
@@ -552,16 +1746,27 @@ def limits_r(x, y):
     
     Parameters
     ----------
-    x : array-like
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
         Vector of subgroup values (usually time). Must be same length as y.
-    y : array-like
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
         Vector of metric values (e.g., performance). Must be same length as x.
+    stream : array-like, optional
+        Vector of stream keys (e.g. tool, chamber, or metric). Must be same length as x.
+        If given, statistics are computed separately for each stream and returned
+        in long format, with a leading stream column. Default is None.
+    as_arrays : bool, optional
+        If True, return a ChartArrays of NumPy arrays instead, for speed in tight
+        loops. Default is False.
     
     Returns
     -------
     pd.DataFrame
         DataFrame with subgroup statistics and control limits (upper, lower)
         One row per subgroup.
+        Or, with as_arrays=True, a ChartArrays with x, r, nw, lower, upper, and rbar.
     
     Examples
     --------
@@ -569,36 +1774,28 @@ def limits_r(x, y):
     >>> water = pd.read_csv("workshops/onsen.csv")
     >>> limits_r(x=water['time'], y=water['temp'])
     """
-    # Make a data.frame
-    data = pd.DataFrame({'x': pd.Series(x), 'y': pd.Series(y)})
+    # Reuse cached results from a SubgroupSummary
+    if isinstance(x, SubgroupSummary) and not as_arrays:
+        return x.limits_r.copy()
     
     # Get within-group stats
-    stat_s = (data.groupby('x')
-              .agg({
-                  'y': ['min', 'max', 'count']
-              })
-              .reset_index())
-    
-    stat_s.columns = ['x', 'y_min', 'y_max', 'nw']
-    stat_s['r'] = stat_s['y_max'] - stat_s['y_min']
-    stat_s['df'] = stat_s['nw'] - 1
-    
-    # For each different subgroup sample size, calculate control constants
-    constants_list = []
-    for nw in stat_s['nw'].unique():
-        dn_stats = dn(n=int(nw), reps=10000)
-        constants_list.append({
-            'nw': nw,
-            'D3': dn_stats['D3'].iloc[0],
-            'D4': dn_stats['D4'].iloc[0]
-        })
-    constants = pd.DataFrame(constants_list)
-    
-    # Join in the control constants
-    stat_s = stat_s.merge(constants, on='nw', how='left')
-    
-    # Add in rbar
-    stat_s['rbar'] = stat_s['r'].mean()
+    data = _as_stats(x, y, stream)
+    if as_arrays:
+        rbar = data.stream_mean(data.r)
+        center = data.per_subgroup(rbar)
+        return _chart_arrays(data, {'r': data.r, 'nw': data.nw,
+                                    'lower': _lookup_constants(data.nw, 'D3') * center,
+                                    'upper': _lookup_constants(data.nw, 'D4') * center},
+                             {'rbar': rbar})
+    stat_s = _with_stream(pd.DataFrame({'x': data.x, 'y_min': data.ymin, 'y_max': data.ymax,
+                                        'nw': data.nw, 'r': data.r, 'df': data.df}), data)
+    
+    # For each subgroup sample size, look up control constants
+    stat_s['D3'] = _lookup_constants(stat_s['nw'], 'D3')
+    stat_s['D4'] = _lookup_constants(stat_s['nw'], 'D4')
+    
+    # Add in rbar (per stream, if any)
+    stat_s['rbar'] = data.per_subgroup(data.stream_mean(data.r))
     
     # Calculate upper and lower control limits
     stat_s['lower'] = stat_s['D3'] * stat_s['rbar']
@@ -607,7 +1804,7 @@ def limits_r(x, y):
     return stat_s
 
 
-def limits_mr(x, y):
+def limits_mr(x, y=None, as_arrays=False, first=None, last=None):
     """
     Get Upper and Lower Control Limits for a Moving Range Chart, using Control Constants
     
@@ -615,15 +1812,25 @@ def limits_mr(x, y):
     
     Parameters
     ----------
-    x : array-like
+    x : array-like or MeasurementStore
         Vector of subgroup values (usually time). Must be same length as y.
-    y : array-like
+        Or, a MeasurementStore, whose timestamps (or subgroup ids, if it has no
+        timestamps) and values are read from disk, in which case y is not needed.
+    y : array-like, optional
         Vector of metric values (e.g., performance). Must be same length as x.
+    as_arrays : bool, optional
+        If True, return a ChartArrays of NumPy arrays instead, for speed in tight
+        loops. Default is False.
+    first, last : int, optional
+        For a MeasurementStore only: read just subgroups first to last (inclusive)
+        from disk. Default is None (the whole history).
     
     Returns
     -------
     pd.DataFrame
         DataFrame with moving range statistics and control limits
+        Or, with as_arrays=True, a ChartArrays with x, mr, mrbar, d2, sigma_s,
+        lower, and upper.
     
     Examples
     --------
@@ -633,17 +1840,31 @@ def limits_mr(x, y):
     >>> indiv = water[water['id'].isin([1, 21, 41, 61, 81, 101, 121, 141])]
     >>> limits_mr(x=indiv['time'], y=indiv['temp'])
     """
-    # Make a data.frame
-    data = pd.DataFrame({'x': pd.Series(x), 'y': pd.Series(y)})
+    # Read from a store on disk, if given one, keeping only the subgroups asked for
+    if isinstance(x, MeasurementStore):
+        subgroup, y, timestamp = x.read(first, last)
+        x = subgroup if timestamp is None else timestamp
+    elif first is not None or last is not None:
+        raise ValueError("first and last only apply when x is a MeasurementStore")
+    
+    # Read x and y as arrays, without first copying them into a data.frame
+    x, y = _as_array(x), _as_array(y, dtype=float)
+    
+    if as_arrays:
+        mr = np.abs(np.diff(y))
+        d2 = _constant(2)['d2']
+        mrbar = mr.mean() if len(mr) else np.nan
+        return ChartArrays(x=x[1:], mr=mr, mrbar=mrbar, d2=d2, sigma_s=mrbar / d2,
+                           lower=0.0, upper=mrbar + 3 * mrbar / d2)
     
     # Convert our original dataset into a set of moving ranges
     data2 = pd.DataFrame({
-        'x': data['x'].iloc[1:].values,
-        'mr': np.abs(np.diff(data['y'].values))
+        'x': x[1:],
+        'mr': np.abs(np.diff(y))
     })
     
-    # Estimate d2 when subgroup size n = 1
-    d2 = np.mean(np.abs(np.diff(rnorm(n=10000, mean=0, sd=1).values)))
+    # d2 when subgroup size n = 1 is the d2 of a range between 2 values
+    d2 = _constant(2)['d2']
     
     # Get average moving range
     mrbar = data2['mr'].mean()
@@ -674,7 +1895,7 @@ def limits_mr(x, y):
     return stat
 
 
-def ggxbar(x, y, xlab="Time (Subgroups)", ylab="Average"):
+def ggxbar(x, y=None, xlab="Time (Subgroups)", ylab="Average"):
     """
     Average Control Chart with ggplot
     
@@ -683,9 +1904,12 @@ def ggxbar(x, y, xlab="Time (Subgroups)", ylab="Average"):
     
     Parameters
     ----------
-    x : array-like
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
         Vector of subgroup values (usually time). Must be same length as y.
-    y : array-like
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
         Vector of metric values (e.g., performance). Must be same length as x.
     xlab : str, optional
         Label for x-axis. Default is "Time (Subgroups)".
@@ -703,16 +1927,19 @@ def ggxbar(x, y, xlab="Time (Subgroups)", ylab="Average"):
     >>> water = pd.read_csv("workshops/onsen.csv")
     >>> ggxbar(x=water['time'], y=water['ph'], xlab="Time (Subgroups)", ylab="Average pH")
     """
-    data = pd.DataFrame({'x': pd.Series(x), 'y': pd.Series(y)})
+    from plotnine import ggplot, aes, geom_ribbon, geom_hline, geom_line, geom_point, geom_label, labs
+    
+    # Group the data once, and cache every statistic
+    data = _as_summary(x, y)
     
     # Get statistics for each subgroup
-    stat_s = get_stat_s(x=data['x'], y=data['y'])
+    stat_s = data.stat_s
     
     # Generate labels
     labels = get_labels(stat_s)
     
     # Get overall statistics
-    stat_t = get_stat_t(x=x, y=y)
+    stat_t = data.stat_t
     
     # Generate plot
     gg = (ggplot() +
@@ -728,7 +1955,7 @@ def ggxbar(x, y, xlab="Time (Subgroups)", ylab="Average"):
     return gg
 
 
-def ggs(x, y, xlab="Time (Subgroups)", ylab="Standard Deviation"):
+def ggs(x, y=None, xlab="Time (Subgroups)", ylab="Standard Deviation"):
     """
     Standard Deviation Chart with ggplot
     
@@ -737,9 +1964,12 @@ def ggs(x, y, xlab="Time (Subgroups)", ylab="Standard Deviation"):
     
     Parameters
     ----------
-    x : array-like
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
         Vector of subgroup values (usually time). Must be same length as y.
-    y : array-like
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
         Vector of metric values (e.g., performance). Must be same length as x.
     xlab : str, optional
         Label for x-axis. Default is "Time (Subgroups)".
@@ -757,14 +1987,16 @@ def ggs(x, y, xlab="Time (Subgroups)", ylab="Standard Deviation"):
     >>> water = pd.read_csv("workshops/onsen.csv")
     >>> ggs(x=water['time'], y=water['temp'], xlab="Time (Subgroups)", ylab="Standard Deviation")
     """
-    # Make data.frame of input vectors
-    data = pd.DataFrame({'x': pd.Series(x), 'y': pd.Series(y)})
+    from plotnine import ggplot, aes, geom_ribbon, geom_hline, geom_line, geom_point, geom_label, labs
+    
+    # Group the data once, and cache every statistic
+    data = _as_summary(x, y)
     
     # Get subgroup statistics, with UCL and LCL for standard deviation
-    stat_s = limits_s(x=data['x'], y=data['y'])
+    stat_s = data.limits_s
     
     # Get overall (total) statistics
-    stat_t = get_stat_t(x=data['x'], y=data['y'])
+    stat_t = data.stat_t
     
     # Get labels
     labels = pd.DataFrame({
@@ -790,7 +2022,7 @@ def ggs(x, y, xlab="Time (Subgroups)", ylab="Standard Deviation"):
     return gg
 
 
-def ggr(x, y, xlab="Time (Subgroups)", ylab="Range"):
+def ggr(x, y=None, xlab="Time (Subgroups)", ylab="Range"):
     """
     Range Chart with ggplot
     
@@ -799,9 +2031,12 @@ def ggr(x, y, xlab="Time (Subgroups)", ylab="Range"):
     
     Parameters
     ----------
-    x : array-like
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
         Vector of subgroup values (usually time). Must be same length as y.
-    y : array-like
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
         Vector of metric values (e.g., performance). Must be same length as x.
     xlab : str, optional
         Label for x-axis. Default is "Time (Subgroups)".
@@ -819,14 +2054,16 @@ def ggr(x, y, xlab="Time (Subgroups)", ylab="Range"):
     >>> water = pd.read_csv("workshops/onsen.csv")
     >>> ggr(x=water['time'], y=water['temp'], xlab="Time (Subgroups)", ylab="Range")
     """
-    # Make data.frame of input vectors
-    data = pd.DataFrame({'x': pd.Series(x), 'y': pd.Series(y)})
+    from plotnine import ggplot, aes, geom_ribbon, geom_hline, geom_line, geom_point, geom_label, labs
+    
+    # Group the data once, and cache every statistic
+    data = _as_summary(x, y)
     
     # Get subgroup statistics, with UCL and LCL for range
-    stat_s = limits_r(x=data['x'], y=data['y'])
+    stat_s = data.limits_r
     
     # Get overall (total) statistics
-    stat_t = get_stat_t(x=data['x'], y=data['y'])
+    stat_t = data.stat_t
     
     # Get labels
     labels = pd.DataFrame({
@@ -852,7 +2089,7 @@ def ggr(x, y, xlab="Time (Subgroups)", ylab="Range"):
     return gg
 
 
-def ggmr(x, y, xlab="Time (Subgroups)", ylab="Moving Range"):
+def ggmr(x, y=None, xlab="Time (Subgroups)", ylab="Moving Range"):
     """
     Moving Range Chart with ggplot
     
@@ -860,9 +2097,10 @@ def ggmr(x, y, xlab="Time (Subgroups)", ylab="Moving Range"):
     
     Parameters
     ----------
-    x : array-like
+    x : array-like or MeasurementStore
         Vector of subgroup values (usually time). Must be same length as y.
-    y : array-like
+        Or, a MeasurementStore, as in limits_mr(), in which case y is not needed.
+    y : array-like, optional
         Vector of metric values (e.g., performance). Must be same length as x.
     xlab : str, optional
         Label for x-axis. Default is "Time (Subgroups)".
@@ -882,17 +2120,10 @@ def ggmr(x, y, xlab="Time (Subgroups)", ylab="Moving Range"):
     >>> indiv = water[water['id'].isin([1, 21, 41, 61, 81, 101, 121, 141])]
     >>> ggmr(x=indiv['time'], y=indiv['temp'], xlab="Time (Subgroups)", ylab="Moving Range")
     """
-    # Make data.frame of input vectors
-    data = pd.DataFrame({'x': pd.Series(x), 'y': pd.Series(y)})
-    
-    # Obtain moving range
-    data2 = pd.DataFrame({
-        'x': data['x'].iloc[1:].values,
-        'mr': np.abs(np.diff(data['y'].values))
-    })
+    from plotnine import ggplot, aes, geom_ribbon, geom_hline, geom_line, geom_point, geom_label, labs
     
-    # Get subgroup statistics, with UCL and LCL for moving range
-    stat_s = limits_mr(x=data['x'], y=data['y'])
+    # Get moving ranges, with UCL and LCL for moving range
+    stat_s = limits_mr(x=x, y=y)
     
     # Get labels
     labels = pd.DataFrame({
@@ -912,7 +2143,7 @@ def ggmr(x, y, xlab="Time (Subgroups)", ylab="Moving Range"):
           geom_hline(data=stat_t, mapping=aes(yintercept='mrbar'), color="lightgrey") +
           geom_ribbon(data=stat_s, mapping=aes(x='x', ymin='lower', ymax='upper'),
                      fill="steelblue", alpha=0.2) +
-          geom_line(data=data2, mapping=aes(x='x', y='mr'), size=1) +
+          geom_line(data=stat_s, mapping=aes(x='x', y='mr'), size=1) +
           geom_point(data=stat_s, mapping=aes(x='x', y='mr'), size=5) +
           geom_label(data=labels, mapping=aes(x='x', y='value', label='text'),
                     ha='right') +  # horizontally justify labels
@@ -921,6 +2152,181 @@ def ggmr(x, y, xlab="Time (Subgroups)", ylab="Moving Range"):
     return gg
 
 
+def _stream_sums(stream, *values):
+    """
+    Sum each vector of values within each stream (or overall, if stream is None),
+    and return each row's stream totals, plus each row's stream count.
+    """
+    if stream is None:
+        n = len(values[0]) if values else 0
+        return [np.full(n, v.sum(), dtype=float) for v in values] + [np.full(n, n)]
+    codes = pd.factorize(stream)[0]
+    sums = [np.bincount(codes, weights=v)[codes] for v in values]
+    return sums + [np.bincount(codes)[codes]]
+
+
+def limits_p(t, x, n, stream=None):
+    """
+    Get Upper and Lower Control Limits for a Fraction Defective (p) Chart
+    
+    Computes the p chart statistics that ggp() draws, without plotting anything,
+    so many product lines can be monitored at once without importing plotnine.
+    
+    Parameters
+    ----------
+    t : array-like
+        Vector of time/subgroup values
+    x : array-like
+        Vector of number of defective items in each subgroup
+    n : array-like
+        Vector of sample sizes for each subgroup
+    stream : array-like, optional
+        Vector of stream keys (e.g. product line). Must be same length as t. If given,
+        each stream gets its own centerline and limits. Default is None.
+    
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with one row per subgroup, in input order, with t, x, n, p, mu,
+        sigma, xsum, nsum, pbar, se, lower, and upper (and stream, if given).
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> inventory = pd.read_csv("workshops/inventory.csv")
+    >>> limits_p(t=inventory['t'], x=inventory['x'], n=inventory['n'])
+    """
+    t, x, n = _as_array(t), _as_array(x), _as_array(n)
+    
+    # Get subgroup statistics
+    p = x / n
+    # Add total traits per stream
+    xsum, nsum, _ = _stream_sums(stream, x, n)
+    # calculate centerline
+    pbar = xsum / nsum
+    # calculate standard deviation with binomial assumptions
+    se = np.sqrt(pbar * (1 - pbar) / n)
+    
+    stat_s = pd.DataFrame({
+        't': t, 'x': x, 'n': n, 'p': p,
+        'mu': n * p, 'sigma': np.sqrt(n * p * (1 - p)),
+        'xsum': xsum, 'nsum': nsum, 'pbar': pbar, 'se': se,
+        # Calculate 3-sigma control limits, clipping the lower limit at zero
+        'lower': np.maximum(pbar - 3 * se, 0), 'upper': pbar + 3 * se
+    })
+    if stream is not None:
+        stat_s.insert(0, 'stream', _as_array(stream))
+    return stat_s
+
+
+def limits_np(t, x, n, stream=None):
+    """
+    Get Upper and Lower Control Limits for a Number Defective (np) Chart
+    
+    Computes the np chart statistics that ggnp() draws, without plotting anything,
+    so many product lines can be monitored at once without importing plotnine.
+    
+    Parameters
+    ----------
+    t : array-like
+        Vector of time/subgroup values
+    x : array-like
+        Vector of number of defective items in each subgroup
+    n : array-like
+        Vector of sample sizes for each subgroup
+    stream : array-like, optional
+        Vector of stream keys (e.g. product line). Must be same length as t. If given,
+        each stream gets its own centerline and limits. Default is None.
+    
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with one row per subgroup, in input order, with t, x, n, p, np,
+        xsum, nsum, npbar, pbar, se, lower, and upper (and stream, if given).
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> inv = pd.read_csv("workshops/inventory.csv")
+    >>> limits_np(t=inv['t'], x=inv['x'], n=inv['n'])
+    """
+    t, x, n = _as_array(t), _as_array(x), _as_array(n)
+    
+    # Get subgroup statistics
+    p = x / n
+    # Add total traits per stream
+    xsum, nsum, count = _stream_sums(stream, x, n)
+    # calculate centerline
+    npbar = xsum / count
+    pbar = xsum / nsum
+    # calculate standard error
+    se = np.sqrt(npbar * (1 - pbar))
+    
+    stat_s = pd.DataFrame({
+        't': t, 'x': x, 'n': n, 'p': p, 'np': n * p,
+        'xsum': xsum, 'nsum': nsum, 'npbar': npbar, 'pbar': pbar, 'se': se,
+        # Calculate 3-sigma control limits, clipping the lower limit at zero
+        'lower': np.maximum(npbar - 3 * se, 0), 'upper': npbar + 3 * se
+    })
+    if stream is not None:
+        stat_s.insert(0, 'stream', _as_array(stream))
+    return stat_s
+
+
+def limits_u(t, x, stream=None):
+    """
+    Get Upper and Lower Control Limits for a Defects per Product (u) Chart
+    
+    Computes the u chart statistics that ggu() draws, without plotting anything,
+    so many product lines can be monitored at once without importing plotnine.
+    
+    Parameters
+    ----------
+    t : array-like
+        Vector of time/subgroup values
+    x : array-like
+        Vector of number of defects observed in each product
+    stream : array-like, optional
+        Vector of stream keys (e.g. product line). Must be same length as t. If given,
+        each stream gets its own centerline and limits. Default is None.
+    
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with one row per subgroup, sorted by stream and t, with t, x
+        (total defects), nw (products), u (defects per product), ubar, se, lower,
+        and upper (and stream, if given).
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> acc = pd.read_csv("workshops/accidents.csv")
+    >>> limits_u(t=acc['t'], x=acc['x'])
+    """
+    x = _as_array(x)
+    
+    # Reduce each subgroup to its total defects and number of products in one pass
+    data = subgroup_stats(x=t, y=x, stream=stream)
+    total = data.total
+    if np.issubdtype(x.dtype, np.integer):
+        total = np.rint(total).astype(x.dtype)
+    
+    # Calculate centerline per stream
+    usum, nwsum, _ = _stream_sums(data.stream, data.total, data.nw)
+    ubar = usum / nwsum
+    se = np.sqrt(ubar / data.nw)
+    
+    stat_s = pd.DataFrame({
+        't': data.x, 'x': total, 'nw': data.nw, 'u': data.total / data.nw,
+        'ubar': ubar, 'se': se,
+        # Curb lower to be no lower than 0
+        'lower': np.maximum(ubar - 3 * se, 0), 'upper': ubar + 3 * se
+    })
+    if data.stream is not None:
+        stat_s.insert(0, 'stream', data.stream)
+    return stat_s
+
+
 def ggp(t, x, n, xlab="Time (Subgroup)", ylab="Fraction Defective"):
     """
     Fraction Defective (p) Chart in ggplot
@@ -953,27 +2359,10 @@ def ggp(t, x, n, xlab="Time (Subgroup)", ylab="Fraction Defective"):
     >>> ggp(t=inventory['t'], x=inventory['x'], n=inventory['n'],
     ...     xlab="Time (Subgroup)", ylab="Fraction Defective")
     """
-    # Make a data.frame
-    data = pd.DataFrame({'t': pd.Series(t), 'x': pd.Series(x), 'n': pd.Series(n)})
+    from plotnine import ggplot, aes, geom_ribbon, geom_hline, geom_line, geom_point, labs
     
-    # Get subgroup statistics
-    stat_s = data.copy()
-    stat_s['p'] = stat_s['x'] / stat_s['n']
-    stat_s['mu'] = stat_s['n'] * stat_s['p']
-    stat_s['sigma'] = np.sqrt(stat_s['n'] * stat_s['p'] * (1 - stat_s['p']))
-    
-    # Add total traits here
-    stat_s['xsum'] = stat_s['x'].sum()
-    stat_s['nsum'] = stat_s['n'].sum()
-    # calculate centerline
-    stat_s['pbar'] = stat_s['xsum'] / stat_s['nsum']
-    # calculate standard deviation with binomial assumptions
-    stat_s['se'] = np.sqrt(stat_s['pbar'] * (1 - stat_s['pbar']) / stat_s['n'])
-    # Calculate 3-sigma control limits
-    stat_s['lower'] = stat_s['pbar'] - 3 * stat_s['se']
-    stat_s['upper'] = stat_s['pbar'] + 3 * stat_s['se']
-    # Clip the lower estimate at zero or higher
-    stat_s.loc[stat_s['lower'] < 0, 'lower'] = 0
+    # Get subgroup statistics, centerline, and 3-sigma control limits
+    stat_s = limits_p(t=t, x=x, n=n)
     
     # Visualize it
     gg = (ggplot() +
@@ -1025,27 +2414,10 @@ def ggnp(t, x, n, xlab="Time (Subgroups)", ylab="Number of Defectives (np)"):
     >>> ggnp(t=inv['t'], x=inv['x'], n=inv['n'],
     ...      xlab="Time (Subgroups)", ylab="Number of Defectives")
     """
-    # Make a data.frame
-    data = pd.DataFrame({'t': pd.Series(t), 'x': pd.Series(x), 'n': pd.Series(n)})
-    
-    # Get subgroup statistics
-    stat_s = data.copy()
-    stat_s['p'] = stat_s['x'] / stat_s['n']
-    stat_s['np'] = stat_s['n'] * stat_s['p']
+    from plotnine import ggplot, aes, geom_ribbon, geom_hline, geom_line, geom_point, geom_label, labs
     
-    # Add total traits here
-    stat_s['xsum'] = stat_s['x'].sum()
-    stat_s['nsum'] = stat_s['n'].sum()
-    # calculate centerline
-    stat_s['npbar'] = (stat_s['n'] * stat_s['p']).sum() / len(stat_s)
-    stat_s['pbar'] = (stat_s['n'] * stat_s['p']).sum() / stat_s['n'].sum()
-    # calculate standard error
-    stat_s['se'] = np.sqrt(stat_s['npbar'] * (1 - stat_s['pbar']))
-    # Calculate 3-sigma control limits
-    stat_s['lower'] = stat_s['npbar'] - 3 * stat_s['se']
-    stat_s['upper'] = stat_s['npbar'] + 3 * stat_s['se']
-    # Clip the lower estimate at zero or higher
-    stat_s.loc[stat_s['lower'] < 0, 'lower'] = 0
+    # Get subgroup statistics, centerline, and 3-sigma control limits
+    stat_s = limits_np(t=t, x=x, n=n)
     
     labels = pd.DataFrame({
         't': [stat_s['t'].max(), stat_s['t'].max(), stat_s['t'].max()],
@@ -1076,7 +2448,7 @@ def ggnp(t, x, n, xlab="Time (Subgroups)", ylab="Number of Defectives (np)"):
     return gg
 
 
-def ggu(t, x, xlab="Time (Subgroups)", ylab="Number of Defects (u)"):
+def ggu(t, x, xlab="Time (Subgroups)", ylab="Defects per Product (u)"):
     """
     Defects per Product (u) Chart in ggplot
     
@@ -1092,7 +2464,7 @@ def ggu(t, x, xlab="Time (Subgroups)", ylab="Number of Defects (u)"):
     xlab : str, optional
         Label for x-axis. Default is "Time (Subgroups)".
     ylab : str, optional
-        Label for y-axis. Default is "Number of Defects (u)".
+        Label for y-axis. Default is "Defects per Product (u)".
     
     Returns
     -------
@@ -1103,24 +2475,12 @@ def ggu(t, x, xlab="Time (Subgroups)", ylab="Number of Defects (u)"):
     --------
     >>> import pandas as pd
     >>> acc = pd.read_csv("workshops/accidents.csv")
-    >>> ggu(t=acc['t'], x=acc['x'], xlab="Time", ylab="Number of Defects")
+    >>> ggu(t=acc['t'], x=acc['x'], xlab="Time", ylab="Defects per Product")
     """
-    data = pd.DataFrame({'t': pd.Series(t), 'x': pd.Series(x)})
-    
-    stat_s = (data.groupby('t')
-              .agg({
-                  'x': ['sum', 'count']
-              })
-              .reset_index())
-    stat_s.columns = ['t', 'u', 'nw']
+    from plotnine import ggplot, aes, geom_ribbon, geom_hline, geom_line, geom_point, geom_label, labs
     
-    # Calculate centerline
-    stat_s['ubar'] = stat_s['u'].sum() / stat_s['nw'].sum()
-    stat_s['se'] = np.sqrt(stat_s['ubar'] / stat_s['nw'])
-    stat_s['lower'] = stat_s['ubar'] - 3 * stat_s['se']
-    stat_s['upper'] = stat_s['ubar'] + 3 * stat_s['se']
-    # Curb lower to be no lower than 0
-    stat_s.loc[stat_s['lower'] < 0, 'lower'] = 0
+    # Get subgroup totals, centerline, and 3-sigma control limits
+    stat_s = limits_u(t=t, x=x)
     
     labels = pd.DataFrame({
         't': [stat_s['t'].max(), stat_s['t'].max(), stat_s['t'].max()],
@@ -1139,14 +2499,14 @@ def ggu(t, x, xlab="Time (Subgroups)", ylab="Number of Defects (u)"):
           # Draw the grand ubar line
           geom_hline(data=stat_s, mapping=aes(yintercept='ubar'),
                     size=1.5, color="darkgrey") +
-          # Draw u over time
+          # Draw defects per product over time
           geom_line(data=stat_s, mapping=aes(x='t', y='u')) +
-          # Draw u over time with points
+          # Draw defects per product over time with points
           geom_point(data=stat_s, mapping=aes(x='t', y='u')) +
           # Add text
           geom_label(data=labels, mapping=aes(x='t', y='value', label='text'), ha='right') +
           # Add labels
-          labs(x=xlab, y=ylab, subtitle="Number of Defects (u) Chart"))
+          labs(x=xlab, y=ylab, subtitle="Defects per Product (u) Chart"))
     
     return gg
 
@@ -1161,149 +2521,1351 @@ def ggavg(x, y, xlab="Time (Subgroups)", ylab="Average"):
     return ggxbar(x, y, xlab=xlab, ylab=ylab)
 
 
-def cp(sigma_s, upper, lower):
+class OnlineChart:
     """
-    Capability Index (for centered, stable processes)
+    Streaming Averages, Standard Deviation, and Range Chart
     
-    Calculates the process capability index Cp, which measures the potential capability 
-    of a centered, stable process. Cp compares the process spread (6*sigma_s) to the 
-    specification width.
+    Keeps running totals for the grand mean, pooled standard deviation, and average
+    range, so each new subgroup updates the control limits in time proportional to its
+    own size instead of the whole history. After each subgroup, the limits match
+    limits_avg(), limits_s(), and limits_r() computed over every subgroup seen so far.
+    Total variance is tracked with the Chan et al. parallel update.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> chart = OnlineChart()
+    >>> # Load the history in one batch, then add new subgroups one at a time
+    >>> chart.update_batch(x=water['time'], y=water['temp'])
+    >>> chart.update(y=[44.1, 45.0, 43.8, 46.2], x=17)
+    >>> state = chart.snapshot()
+    >>> chart = OnlineChart.restore(state)
+    """
+    
+    # Running totals saved by snapshot()
+    _STATE = ['k', 'xbar_sum', 'r_sum', 'm2_sum', 'df_sum', 'n', 'mean', 'm2']
+    
+    def __init__(self):
+        # number of subgroups
+        self.k = 0
+        # running sums of subgroup means and ranges
+        self.xbar_sum = 0.0
+        self.r_sum = 0.0
+        # running sums of within-subgroup squared deviations and degrees of freedom
+        self.m2_sum = 0.0
+        self.df_sum = 0
+        # running count, mean, and squared deviations of all observations
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def __repr__(self):
+        return f"OnlineChart(subgroups={self.k}, n={self.n})"
+    
+    @property
+    def xbbar(self):
+        """Grand mean of subgroup means"""
+        return self.xbar_sum / self.k if self.k > 0 else np.nan
+    
+    @property
+    def sbar(self):
+        """Pooled within-subgroup standard deviation"""
+        return np.sqrt(self.m2_sum / self.df_sum) if self.df_sum > 0 else np.nan
+    
+    @property
+    def rbar(self):
+        """Average range"""
+        return self.r_sum / self.k if self.k > 0 else np.nan
+    
+    @property
+    def sigma_t(self):
+        """Total standard deviation"""
+        return np.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else np.nan
+    
+    def update(self, y, x=None):
+        """
+        Add one subgroup and return its statistics, status, and current limits
+        
+        Parameters
+        ----------
+        y : array-like
+            Metric values in the new subgroup
+        x : optional
+            Subgroup value (usually time). Default is None, which numbers subgroups 1, 2, 3...
+        
+        Returns
+        -------
+        dict
+            Dictionary with keys: x, nw, xbar, s, r, xbbar, sbar, rbar,
+            xbar_lower, xbar_upper, xbar_out, s_lower, s_upper, s_out,
+            r_lower, r_upper, r_out
+        """
+        y = np.asarray(y, dtype=float)
+        y = y[~np.isnan(y)]
+        mean = y.mean()
+        data = SubgroupStats(x=[self.k + 1 if x is None else x], nw=[len(y)],
+                             total=[y.sum()], m2=[((y - mean)**2).sum()],
+                             ymin=[y.min()], ymax=[y.max()])
+        return {k: v[0] for k, v in self._push(data).items()}
+    
+    def update_batch(self, x, y=None):
+        """
+        Add many subgroups at once, in order of x
+        
+        Parameters
+        ----------
+        x : array-like or SubgroupStats
+            Vector of subgroup values (usually time). Must be same length as y.
+            Or, the output of subgroup_stats(), in which case y is not needed.
+        y : array-like, optional
+            Vector of metric values (e.g., performance). Must be same length as x.
+        
+        Returns
+        -------
+        pd.DataFrame
+            One row per subgroup, with the same columns as the keys from update().
+        """
+        return pd.DataFrame(self._push(_as_stats(x, y)))
+    
+    def _push(self, data):
+        """
+        Update running totals with a SubgroupStats, returning each subgroup's limits
+        """
+        # Running totals after each new subgroup
+        k = self.k + np.arange(1, len(data) + 1)
+        xbbar = (self.xbar_sum + np.cumsum(data.xbar)) / k
+        rbar = (self.r_sum + np.cumsum(data.r)) / k
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sbar = np.sqrt((self.m2_sum + np.cumsum(data.m2)) /
+                           (self.df_sum + np.cumsum(data.df)))
+        
+        out = {'x': data.x, 'nw': data.nw, 'xbar': data.xbar, 's': data.s, 'r': data.r,
+               'xbbar': xbbar, 'sbar': sbar, 'rbar': rbar}
+        A3 = _lookup_constants(data.nw, 'A3')
+        out['xbar_lower'] = xbbar - A3 * sbar
+        out['xbar_upper'] = xbbar + A3 * sbar
+        out['s_lower'] = _lookup_constants(data.nw, 'B3') * sbar
+        out['s_upper'] = _lookup_constants(data.nw, 'B4') * sbar
+        out['r_lower'] = _lookup_constants(data.nw, 'D3') * rbar
+        out['r_upper'] = _lookup_constants(data.nw, 'D4') * rbar
+        for stat in ['xbar', 's', 'r']:
+            out[stat + '_out'] = (out[stat] < out[stat + '_lower']) | (out[stat] > out[stat + '_upper'])
+        
+        # Update running totals
+        self.k += len(data)
+        self.xbar_sum += data.xbar.sum()
+        self.r_sum += data.r.sum()
+        self.m2_sum += data.m2.sum()
+        self.df_sum += int(data.df.sum())
+        # Merge the new observations into the total variance (Chan et al.)
+        n_b = data.n
+        mean_b = data.total.sum() / n_b
+        m2_b = data.m2.sum() + (data.nw * (data.xbar - mean_b)**2).sum()
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.m2 += m2_b + delta**2 * self.n * n_b / n
+        self.mean += delta * n_b / n
+        self.n = n
+        
+        return out
+    
+    def freeze(self, chart="xbar"):
+        """
+        Freeze the current "xbar", "s", or "r" limits as a ControlLimits object
+        """
+        if chart == "xbar":
+            return ControlLimits(chart, center=self.xbbar, scale=self.sbar)
+        elif chart == "s":
+            return ControlLimits(chart, center=self.sbar)
+        elif chart == "r":
+            return ControlLimits(chart, center=self.rbar)
+        raise ValueError("chart must be one of: xbar, s, r")
+    
+    def snapshot(self):
+        """
+        Return the chart's running totals as a dictionary of plain numbers
+        """
+        return {k: np.asarray(getattr(self, k)).item() for k in self._STATE}
+    
+    @classmethod
+    def restore(cls, state):
+        """
+        Rebuild a chart from the output of snapshot()
+        """
+        chart = cls()
+        for k in cls._STATE:
+            setattr(chart, k, state[k])
+        return chart
+
+
+class ControlLimits:
+    """
+    Frozen Control Limits for Phase II Monitoring
+    
+    Stores the center line (and spread) estimated once from Phase I data, then
+    scores new subgroups against them without re-estimating anything. Control
+    constants are computed once for each subgroup size seen, and cached. Usually
+    built by freeze_limits().
     
     Parameters
     ----------
-    sigma_s : float
-        Within-subgroup standard deviation (short-term variation)
-    upper : float
-        Upper specification limit
-    lower : float
-        Lower specification limit
-    
-    Returns
-    -------
-    float
-        A single numeric value representing the Cp index. Values > 1 indicate the 
-        process spread is smaller than the specification width.
+    chart : str
+        One of "xbar", "s", "r", "mr", "p", "np", "u", "c".
+    center : float
+        Center line: xbbar, sbar, rbar, mrbar, pbar, npbar, ubar, or cbar.
+    scale : float, optional
+        sbar for "xbar" charts, sigma_s for "mr" charts, and pbar for "np" charts.
+        Not used by other charts.
     
     Examples
     --------
-    >>> # Calculate Cp for a process with sigma_s = 2, USL = 100, LSL = 80
-    >>> cp(sigma_s=2, upper=100, lower=80)
-    >>> # Cp = (100 - 80) / (6 * 2) = 20 / 12 = 1.67
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> frozen = freeze_limits(x=water['time'], y=water['temp'], chart="xbar")
+    >>> frozen.score(x=water['time'], y=water['temp'])
     """
-    return abs(upper - lower) / (6*sigma_s)
+    
+    def __init__(self, chart, center, scale=None):
+        if chart not in _CHARTS:
+            raise ValueError("chart must be one of: " + ", ".join(_CHARTS))
+        self.chart = chart
+        self.center = float(center)
+        self.scale = None if scale is None else float(scale)
+        # Cached control constants, keyed by constant name and then subgroup size
+        self._tables = {}
+    
+    def __repr__(self):
+        return f"ControlLimits(chart='{self.chart}', center={self.center:.4g})"
+    
+    def _constants(self, name, nw):
+        """
+        Look up a control constant for each subgroup size, computing it only for the
+        sizes present and caching it by size
+        """
+        table = self._tables.setdefault(name, {})
+        sizes, inverse = np.unique(nw, return_inverse=True)
+        for k in sizes:
+            if k not in table:
+                table[k] = _constant(int(k))[name]
+        values = np.array([table[k] for k in sizes], dtype=float)
+        return values[inverse]
+    
+    def limits(self, n):
+        """
+        Get the lower and upper control limits for one or more subgroup (sample) sizes
+        
+        Parameters
+        ----------
+        n : int or array-like
+            Subgroup sizes (or sample sizes, for attribute charts)
+        
+        Returns
+        -------
+        tuple
+            Two arrays: lower and upper limits
+        """
+        n = np.atleast_1d(np.asarray(n))
+        center = self.center
+        if self.chart == "xbar":
+            a3 = self._constants('A3', n.astype(np.int64))
+            return center - a3 * self.scale, center + a3 * self.scale
+        elif self.chart == "s":
+            nw = n.astype(np.int64)
+            return self._constants('B3', nw) * center, self._constants('B4', nw) * center
+        elif self.chart == "r":
+            nw = n.astype(np.int64)
+            return self._constants('D3', nw) * center, self._constants('D4', nw) * center
+        elif self.chart == "mr":
+            # Lower ALWAYS equals 0 for moving range
+            return np.zeros(len(n)), np.full(len(n), center + 3 * self.scale)
+        elif self.chart == "p":
+            se = np.sqrt(center * (1 - center) / n)
+        elif self.chart == "np":
+            se = np.full(len(n), np.sqrt(center * (1 - self.scale)))
+        elif self.chart == "u":
+            se = np.sqrt(center / n)
+        elif self.chart == "c":
+            se = np.full(len(n), np.sqrt(center))
+        # Clip the lower limit of attribute charts at zero
+        return np.maximum(center - 3 * se, 0), center + 3 * se
+    
+    def score(self, x, y=None, n=None):
+        """
+        Score new subgroups against the frozen limits
+        
+        Parameters
+        ----------
+        x : array-like
+            Vector of subgroup values (usually time). For "p", "np", "u", and "c"
+            charts, the vector of time/subgroup values t.
+        y : array-like, optional
+            Vector of metric values. For "p" and "np" charts, the number of defective
+            items; for "u" and "c" charts, the number of defects.
+        n : array-like, optional
+            Vector of sample sizes, for "p", "np", and "u" charts only. For "u" charts,
+            if not given, each row counts as one unit and rows are totaled by x.
+        
+        Returns
+        -------
+        pd.DataFrame
+            One row per subgroup with the chart statistic, center line, lower and
+            upper limits, and out (True if the statistic falls outside the limits).
+        """
+        chart = self.chart
+        if chart in ["xbar", "s", "r"]:
+            data = _as_stats(x, y)
+            stat = {'xbar': data.xbar, 's': data.s, 'r': data.r}[chart]
+            output = pd.DataFrame({'x': data.x, 'nw': data.nw, chart: stat})
+            size = data.nw
+        elif chart == "mr":
+            y = np.asarray(y, dtype=float)
+            output = pd.DataFrame({'x': np.asarray(x)[1:], 'mr': np.abs(np.diff(y))})
+            size = np.ones(len(output))
+        elif chart in ["p", "np"]:
+            output = pd.DataFrame({'t': np.asarray(x), 'x': np.asarray(y), 'n': np.asarray(n)})
+            output[chart] = output['x'] / output['n'] if chart == "p" else output['x']
+            size = output['n'].to_numpy()
+        elif chart == "u" and n is not None:
+            # Each row is one sample of defects found across n units
+            output = pd.DataFrame({'t': np.asarray(x), 'x': np.asarray(y), 'n': np.asarray(n)})
+            output['u'] = output['x'] / output['n']
+            size = output['n'].to_numpy()
+        elif chart == "u":
+            # Each row is one unit inspected, so total the defects in each subgroup,
+            # and compare defects per unit against the per-unit limits
+            data = subgroup_stats(x=x, y=y)
+            output = pd.DataFrame({'t': data.x, 'x': data.total, 'nw': data.nw,
+                                   'u': data.total / data.nw})
+            size = data.nw
+        elif chart == "c":
+            output = pd.DataFrame({'t': np.asarray(x), 'c': np.asarray(y)})
+            size = np.ones(len(output))
+        
+        output[_CENTERS[chart]] = self.center
+        output['lower'], output['upper'] = self.limits(size)
+        output['out'] = (output[chart] < output['lower']) | (output[chart] > output['upper'])
+        return output
 
 
-def pp(sigma_t, upper, lower):
+# Chart types supported by ControlLimits, and the name of each chart's center line
+_CHARTS = ["xbar", "s", "r", "mr", "p", "np", "u", "c"]
+_CENTERS = {"xbar": "xbbar", "s": "sbar", "r": "rbar", "mr": "mrbar",
+            "p": "pbar", "np": "npbar", "u": "ubar", "c": "cbar"}
+
+
+def freeze_limits(x, y=None, n=None, chart="xbar"):
     """
-    Process Performance Index (for centered, unstable processes)
+    Freeze Control Limits from Phase I Data
     
-    Calculates the process performance index Pp, which measures the potential performance 
-    of a centered process using total variation. Pp compares the process spread (6*sigma_t) 
-    to the specification width.
+    Estimates the center line and spread for one control chart, using the same logic
+    as limits_avg(), limits_s(), limits_r(), limits_mr(), limits_p(), limits_np(),
+    and limits_u() (or the average count, for "c" charts), and returns them as a ControlLimits object for scoring new (Phase II) data.
     
     Parameters
     ----------
-    sigma_t : float
-        Total standard deviation (long-term variation)
-    upper : float
-        Upper specification limit
-    lower : float
-        Lower specification limit
+    x : array-like, SubgroupStats, or SubgroupSummary
+        Vector of subgroup values (usually time). For "p", "np", "u", and "c" charts,
+        the vector of time/subgroup values t.
+    y : array-like, optional
+        Vector of metric values. For "p" and "np" charts, the number of defective
+        items; for "u" and "c" charts, the number of defects.
+    n : array-like, optional
+        Vector of sample sizes, for "p", "np", and "u" charts only. For "u" charts,
+        if not given, each row counts as one unit inspected.
+    chart : str, optional
+        One of "xbar", "s", "r", "mr", "p", "np", "u", "c". Default is "xbar".
     
     Returns
     -------
-    float
-        A single numeric value representing the Pp index. Values > 1 indicate the 
-        process spread is smaller than the specification width.
+    ControlLimits
+        Frozen limits, with a score() method for new data.
     
     Examples
     --------
-    >>> # Calculate Pp for a process with sigma_t = 2.5, USL = 100, LSL = 80
-    >>> pp(sigma_t=2.5, upper=100, lower=80)
-    >>> # Pp = (100 - 80) / (6 * 2.5) = 20 / 15 = 1.33
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> phase1 = water[water['time'] <= 7]
+    >>> phase2 = water[water['time'] > 7]
+    >>> frozen = freeze_limits(x=phase1['time'], y=phase1['temp'], chart="s")
+    >>> frozen.score(x=phase2['time'], y=phase2['temp'])
     """
-    return abs(upper - lower) / (6*sigma_t)
+    if chart not in _CHARTS:
+        raise ValueError("chart must be one of: " + ", ".join(_CHARTS))
+    
+    if chart in ["xbar", "s", "r"]:
+        data = _as_summary(x, y)
+        if chart == "xbar":
+            return ControlLimits(chart, center=data.xbbar, scale=data.sigma_s)
+        elif chart == "s":
+            return ControlLimits(chart, center=data.sigma_s)
+        return ControlLimits(chart, center=data.rbar)
+    elif chart == "mr":
+        stat = limits_mr(x=x, y=y)
+        return ControlLimits(chart, center=stat['mrbar'].iloc[0], scale=stat['sigma_s'].iloc[0])
+    
+    defects = np.asarray(y, dtype=float)
+    if chart == "p":
+        return ControlLimits(chart, center=defects.sum() / np.sum(n))
+    elif chart == "np":
+        return ControlLimits(chart, center=defects.sum() / len(defects),
+                             scale=defects.sum() / np.sum(n))
+    elif chart == "u" and n is not None:
+        return ControlLimits(chart, center=defects.sum() / np.sum(n))
+    # u charts otherwise count each row of x as one unit inspected, and c charts one sample
+    return ControlLimits(chart, center=defects.sum() / len(defects))
 
 
-def cpk(mu, sigma_s, lower=None, upper=None):
+class OnlineAttributeChart:
     """
-    Capability Index (for uncentered, stable processes)
+    Streaming Attribute Chart (p, np, u, or c)
     
-    Calculates the process capability index Cpk, which measures the actual capability 
-    of a stable process that may not be centered. Cpk considers both the process mean 
-    location and within-subgroup variation.
+    Keeps running totals of defects (sum of x), sample sizes (sum of n), and samples,
+    so each new sample updates the center line and its control limits in constant
+    time. After each sample, the center line matches limits_p(), limits_np(), or
+    limits_u() computed over every sample seen so far, and the limits use that
+    sample's own size n, so sample sizes may vary. Freeze the limits with freeze()
+    to score Phase II data.
     
     Parameters
     ----------
-    mu : float
-        Process mean
-    sigma_s : float
-        Within-subgroup standard deviation (short-term variation)
-    lower : float, optional
-        Lower specification limit. If None, only upper limit is used.
-    upper : float, optional
-        Upper specification limit. If None, only lower limit is used.
+    chart : str, optional
+        One of "p" (fraction defective), "np" (number defective), "u" (defects per
+        unit, with n units per sample), or "c" (defects per sample of constant size).
+        The u statistic is defects per unit (y / n), which equals ggu()'s statistic
+        when each sample is one unit.
+        Default is "p".
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> inv = pd.read_csv("workshops/inventory.csv")
+    >>> chart = OnlineAttributeChart("p")
+    >>> # Load the history in one batch, then add new samples one at a time
+    >>> chart.update_batch(x=inv['t'], y=inv['x'], n=inv['n'])
+    >>> chart.update(y=3, n=100)
+    >>> frozen = chart.freeze()
+    >>> state = chart.snapshot()
+    >>> chart = OnlineAttributeChart.restore(state)
+    """
+    
+    # Running totals saved by snapshot()
+    _STATE = ['chart', 'k', 'xsum', 'nsum']
+    
+    def __init__(self, chart="p"):
+        if chart not in ["p", "np", "u", "c"]:
+            raise ValueError("chart must be one of: p, np, u, c")
+        self.chart = chart
+        # number of samples
+        self.k = 0
+        # running sums of defects and sample sizes
+        self.xsum = 0.0
+        self.nsum = 0.0
+    
+    def __repr__(self):
+        return f"OnlineAttributeChart(chart='{self.chart}', samples={self.k}, center={self.center:.4g})"
+    
+    @property
+    def pbar(self):
+        """Defects per unit sampled (pbar, or ubar)"""
+        return self.xsum / self.nsum if self.nsum > 0 else np.nan
+    
+    @property
+    def center(self):
+        """Center line: pbar, npbar, ubar, or cbar"""
+        if self.chart in ["p", "u"]:
+            return self.pbar
+        return self.xsum / self.k if self.k > 0 else np.nan
+    
+    def update(self, y, n=None, x=None):
+        """
+        Add one sample and return its statistic, current limits, and status
+        
+        Parameters
+        ----------
+        y : int or float
+            Number of defective items ("p", "np") or defects ("u", "c") in the new sample
+        n : int or float, optional
+            Sample size (units inspected). Required for "p" and "np" charts; defaults
+            to 1 for "u" charts, and is not used by "c" charts.
+        x : optional
+            Sample value (usually time). Default is None, which numbers samples 1, 2, 3...
+        
+        Returns
+        -------
+        dict
+            Dictionary with keys: t, x, n, the chart statistic (p, np, u, or c),
+            its center line (pbar, npbar, ubar, or cbar), lower, upper, out
+        """
+        t = [self.k + 1 if x is None else x]
+        out = self._push(t, [y], None if n is None else [n])
+        return {k: v[0] for k, v in out.items()}
+    
+    def update_batch(self, x, y, n=None):
+        """
+        Add many samples at once, in order
+        
+        Parameters
+        ----------
+        x : array-like
+            Vector of time/subgroup values t. Must be same length as y.
+        y : array-like
+            Vector of defective items ("p", "np") or defects ("u", "c") per sample.
+        n : array-like, optional
+            Vector of sample sizes. Required for "p" and "np" charts. For "u" charts,
+            if not given, each row counts as one unit and rows are totaled by x, as in
+            ggu(). Not used by "c" charts.
+        
+        Returns
+        -------
+        pd.DataFrame
+            One row per sample, with the same columns as the keys from update().
+        """
+        if self.chart == "u" and n is None:
+            # Each row is one unit inspected, so total the defects in each subgroup
+            data = subgroup_stats(x=x, y=y)
+            x, y, n = data.x, data.total, data.nw
+        return pd.DataFrame(self._push(x, y, n))
+    
+    def _push(self, x, y, n):
+        """
+        Update running totals with new samples, returning each sample's limits
+        """
+        y = np.asarray(y, dtype=float)
+        if n is None:
+            if self.chart in ["p", "np"]:
+                raise ValueError("n (sample size) is required for p and np charts")
+            n = np.ones(len(y))
+        n = np.asarray(n, dtype=float)
+        chart = self.chart
+        
+        # Running totals after each new sample
+        k = self.k + np.arange(1, len(y) + 1)
+        xsum = self.xsum + np.cumsum(y)
+        nsum = self.nsum + np.cumsum(n)
+        if chart == "p":
+            stat, center = y / n, xsum / nsum
+            se = np.sqrt(center * (1 - center) / n)
+        elif chart == "np":
+            stat, center = y, xsum / k
+            se = np.sqrt(center * (1 - xsum / nsum))
+        elif chart == "u":
+            # Defects per unit, so samples of different sizes are comparable
+            stat, center = y / n, xsum / nsum
+            se = np.sqrt(center / n)
+        else:
+            stat, center = y, xsum / k
+            se = np.sqrt(center)
+        # Clip the lower limit at zero
+        lower, upper = np.maximum(center - 3 * se, 0), center + 3 * se
+        
+        out = {'t': np.asarray(x), 'x': y, 'n': n, chart: stat, _CENTERS[chart]: center,
+               'lower': lower, 'upper': upper, 'out': (stat < lower) | (stat > upper)}
+        
+        # Update running totals
+        if len(y) > 0:
+            self.k = int(k[-1])
+            self.xsum = float(xsum[-1])
+            self.nsum = float(nsum[-1])
+        return out
+    
+    def freeze(self):
+        """
+        Freeze the current limits as a ControlLimits object, for Phase II scoring
+        """
+        if self.k == 0:
+            raise ValueError("chart has no samples to freeze")
+        if self.chart == "np":
+            return ControlLimits(self.chart, center=self.center, scale=self.pbar)
+        return ControlLimits(self.chart, center=self.center)
+    
+    def snapshot(self):
+        """
+        Return the chart's running totals as a dictionary of plain values
+        """
+        return {k: np.asarray(getattr(self, k)).item() for k in self._STATE}
+    
+    @classmethod
+    def restore(cls, state):
+        """
+        Rebuild a chart from the output of snapshot()
+        """
+        chart = cls(state['chart'])
+        for k in cls._STATE:
+            setattr(chart, k, state[k])
+        return chart
+
+
+# Center line that goes with each chart statistic
+_STAT_CENTERS = [('xbar', 'xbbar'), ('s', 'sbar'), ('r', 'rbar'), ('mr', 'mrbar'),
+                 ('p', 'pbar'), ('np', 'npbar'), ('u', 'ubar'), ('c', 'cbar')]
+
+
+def _window_count(flags, k):
+    """
+    Count True flags in the trailing window of k points ending at each point,
+    returning -1 where fewer than k points are available
+    """
+    c = np.r_[0, np.cumsum(flags)]
+    count = np.full(len(flags), -1)
+    if len(flags) >= k:
+        count[k - 1:] = c[k:] - c[:-k]
+    return count
+
+
+def nelson_rules(stat, center, upper, lower):
+    """
+    Western Electric / Nelson Run Rules
+    
+    Checks a series of chart statistics against the eight Nelson run rules, using
+    rolling-window counts built from cumulative sums. Sigma zones come from the
+    distance between the center line and each control limit, so asymmetric limits
+    (like on s and r charts) are handled. Each point is flagged for a rule when it
+    completes that rule's pattern.
+    
+    Parameters
+    ----------
+    stat : array-like
+        Chart statistic for each point (e.g. xbar, s, r, or mr), in time order
+    center : float or array-like
+        Center line
+    upper : float or array-like
+        Upper 3-sigma control limit
+    lower : float or array-like
+        Lower 3-sigma control limit
     
     Returns
     -------
-    float
-        A single numeric value representing the Cpk index. Returns the minimum of the 
-        upper and lower capability ratios if both limits are provided, otherwise returns 
-        the appropriate one-sided ratio. Values > 1 indicate the process is capable.
+    np.ndarray
+        Integer bitmask per point. Bit k - 1 is set when rule k is violated, so a
+        value of 0 means no violations. Use (mask >> (k - 1)) & 1 to test rule k.
+    
+    Notes
+    -----
+    1. 1 point beyond the 3-sigma limits
+    2. 9 points in a row on the same side of the center line
+    3. 6 points in a row steadily increasing or decreasing
+    4. 14 points in a row alternating up and down
+    5. 2 of 3 points in a row beyond 2 sigma, on the same side
+    6. 4 of 5 points in a row beyond 1 sigma, on the same side
+    7. 15 points in a row within 1 sigma
+    8. 8 points in a row beyond 1 sigma, on both sides
     
     Examples
     --------
-    >>> # Calculate Cpk with both limits
-    >>> cpk(mu=90, sigma_s=2, lower=80, upper=100)
-    >>> 
-    >>> # Calculate Cpk with only upper limit
-    >>> cpk(mu=90, sigma_s=2, upper=100)
-    >>> 
-    >>> # Calculate Cpk with only lower limit
-    >>> cpk(mu=90, sigma_s=2, lower=80)
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> stat = limits_avg(x=water['time'], y=water['temp'])
+    >>> nelson_rules(stat['xbar'], stat['xbbar'], stat['upper'], stat['lower'])
     """
-    a = None
-    b = None
-    if lower is not None:
-        a = abs(mu - lower) / (3*sigma_s)
-    if upper is not None:
-        b = abs(upper - mu) / (3*sigma_s)
-    if (lower is not None) and (upper is not None):
-        return min(a, b)
-    return a if upper is None else b
+    stat = np.asarray(stat, dtype=float)
+    center, upper, lower = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in [center, upper, lower]], stat)[:3]
+    
+    # Distance from the center line in sigma units, on each side
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(stat >= center, 3 * (stat - center) / (upper - center),
+                     -3 * (center - stat) / (center - lower))
+    above, below = stat > center, stat < center
+    
+    # Direction of each step, aligned so step i ends at point i
+    step = np.r_[0, np.sign(np.diff(stat))]
+    
+    rules = [
+        (stat > upper) | (stat < lower),
+        (_window_count(above, 9) == 9) | (_window_count(below, 9) == 9),
+        (_window_count(step > 0, 5) == 5) | (_window_count(step < 0, 5) == 5),
+        _window_count(np.r_[False, step[1:] * step[:-1] < 0], 12) == 12,
+        (_window_count(z > 2, 3) >= 2) | (_window_count(z < -2, 3) >= 2),
+        (_window_count(z > 1, 5) >= 4) | (_window_count(z < -1, 5) >= 4),
+        _window_count(np.abs(z) < 1, 15) == 15,
+        ((_window_count(np.abs(z) > 1, 8) == 8) &
+         (_window_count(z > 1, 8) < 8) & (_window_count(z < -1, 8) < 8))
+    ]
+    
+    mask = np.zeros(len(stat), dtype=np.int64)
+    for k, flags in enumerate(rules):
+        mask |= flags.astype(np.int64) << k
+    return mask
 
 
-def ppk(mu, sigma_t, lower=None, upper=None):
+def get_rules(data, stat=None, center=None):
     """
-    Process Performance Index (for uncentered, unstable processes)
+    Check Chart Output for Nelson Rule Violations
     
-    Calculates the process performance index Ppk, which measures the actual performance 
-    of a process that may not be centered or stable. Ppk considers both the process mean 
-    location and total variation.
+    Runs nelson_rules() over the output of a chart function, such as limits_avg(),
+    limits_s(), limits_r(), limits_mr(), get_stat_s(), or ControlLimits.score().
     
     Parameters
     ----------
-    mu : float
-        Process mean
-    sigma_t : float
-        Total standard deviation (long-term variation)
-    lower : float, optional
-        Lower specification limit. If None, only upper limit is used.
-    upper : float, optional
-        Upper specification limit. If None, only lower limit is used.
+    data : pd.DataFrame
+        Chart statistics in time order, with upper and lower columns.
+    stat : str, optional
+        Name of the statistic column. Default is None, which picks the first of
+        xbar, s, r, mr, p, np, or u that has a matching center line column.
+    center : str, optional
+        Name of the center line column. Default is None, which uses the center
+        line that matches stat (e.g. xbbar for xbar).
     
     Returns
     -------
-    float
-        A single numeric value representing the Ppk index. Returns the minimum of the 
-        upper and lower performance ratios if both limits are provided, otherwise returns 
-        the appropriate one-sided ratio. Values > 1 indicate the process is performing 
-        within specifications.
+    pd.DataFrame
+        A copy of data with an added rules column, holding the violation bitmask
+        from nelson_rules(). If data has a stream column, rules are checked
+        separately within each stream.
     
     Examples
     --------
-    >>> # Calculate Ppk with both limits
-    >>> ppk(mu=90, sigma_t=2.5, lower=80, upper=100)
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> get_rules(limits_s(x=water['time'], y=water['temp']))
+    """
+    if stat is None:
+        pairs = [(a, b) for a, b in _STAT_CENTERS if a in data.columns and b in data.columns]
+        if len(pairs) == 0:
+            raise ValueError("could not find a chart statistic; please supply stat and center")
+        stat, default = pairs[0]
+    else:
+        default = dict(_STAT_CENTERS).get(stat)
+    center = default if center is None else center
+    
+    output = data.copy()
+    output['rules'] = 0
+    groups = output.groupby('stream', sort=False).indices.values() if 'stream' in output else [np.arange(len(output))]
+    for rows in groups:
+        part = output.iloc[rows]
+        output.iloc[rows, output.columns.get_loc('rules')] = nelson_rules(
+            part[stat], part[center], part['upper'], part['lower'])
+    return output
+
+
+class RuleMonitor:
+    """
+    Incremental Nelson Rule Checks for a Live Chart
+    
+    Keeps the last 14 points of a chart, which is all the history the longest
+    run rule needs, and checks each new point (or batch of points) with
+    nelson_rules() as it arrives.
+    
+    Examples
+    --------
+    >>> monitor = RuleMonitor()
+    >>> chart = OnlineChart()
+    >>> point = chart.update(y=[44.1, 45.0, 43.8, 46.2])
+    >>> monitor.update(point['xbar'], point['xbbar'], point['xbar_upper'], point['xbar_lower'])
+    """
+    
+    # Points of history kept; rule 7 looks back over 15 points in a row
+    _MEMORY = 14
+    
+    def __init__(self):
+        self._tail = np.empty((4, 0))
+    
+    def update(self, stat, center, upper, lower):
+        """
+        Check one new point, returning its violation bitmask
+        """
+        return int(self.update_batch([stat], center, upper, lower)[0])
+    
+    def update_batch(self, stat, center, upper, lower):
+        """
+        Check a batch of new points in time order, returning their violation bitmasks
+        """
+        stat = np.atleast_1d(np.asarray(stat, dtype=float))
+        new = np.vstack(np.broadcast_arrays(stat, *[np.asarray(v, dtype=float) for v in [center, upper, lower]]))
+        series = np.hstack([self._tail, new])
+        mask = nelson_rules(*series)[self._tail.shape[1]:]
+        self._tail = series[:, -self._MEMORY:]
+        return mask
+
+
+def limits_ewma(x, y=None, lam=0.2, L=3):
+    """
+    Get Upper and Lower Control Limits for an Exponentially Weighted Moving Average Chart
+    
+    Smooths subgroup means with an exponentially weighted moving average (EWMA), which
+    catches small, persistent shifts that an averages chart can miss. The EWMA and its
+    exact time-varying variance are both computed as linear recursions with
+    scipy.signal.lfilter, starting from the grand mean and the pooled sigma_s from
+    get_stat_s().
+    
+    Parameters
+    ----------
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
+        Vector of subgroup values (usually time). Must be same length as y.
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
+        Vector of metric values (e.g., performance). Must be same length as x.
+    lam : float, optional
+        Weight given to each new subgroup mean, between 0 and 1. Default is 0.2.
+    L : float, optional
+        Width of the control limits, in standard errors. Default is 3.
+    
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: x, xbar, nw, ewma, xbbar, sigma_s, se, lower, upper
+        One row per subgroup.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> limits_ewma(x=water['time'], y=water['temp'], lam=0.2, L=3)
+    """
+    data = _as_stats(x, y)
+    xbar = data.xbar
+    xbbar = xbar.mean()
+    sigma_s = data.sigma_s
+    
+    # z[t] = lam * xbar[t] + (1 - lam) * z[t-1], starting from z[0] = xbbar
+    ewma = signal.lfilter([lam], [1, -(1 - lam)], xbar, zi=[(1 - lam) * xbbar])[0]
+    # var[t] = lam^2 * sigma_s^2 / nw[t] + (1 - lam)^2 * var[t-1], starting from 0
+    var = signal.lfilter([lam**2], [1, -(1 - lam)**2], sigma_s**2 / data.nw)
+    
+    stat = pd.DataFrame({'x': data.x, 'xbar': xbar, 'nw': data.nw, 'ewma': ewma})
+    stat['xbbar'] = xbbar
+    stat['sigma_s'] = sigma_s
+    stat['se'] = np.sqrt(var)
+    stat['lower'] = stat['xbbar'] - L * stat['se']
+    stat['upper'] = stat['xbbar'] + L * stat['se']
+    
+    return stat
+
+
+class OnlineEWMA:
+    """
+    Streaming Exponentially Weighted Moving Average Chart
+    
+    Holds the current EWMA and its exact variance, and updates both (and the
+    time-varying control limits) in constant time as each new subgroup arrives.
+    Uses the same recursions as limits_ewma().
+    
+    Parameters
+    ----------
+    center : float
+        Target mean, usually xbbar from Phase I data
+    sigma_s : float
+        Within-subgroup standard deviation, usually sigma_s from get_stat_s()
+    lam : float, optional
+        Weight given to each new subgroup mean, between 0 and 1. Default is 0.2.
+    L : float, optional
+        Width of the control limits, in standard errors. Default is 3.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> chart = OnlineEWMA.from_data(x=water['time'], y=water['temp'])
+    >>> chart.update(y=[44.1, 45.0, 43.8, 46.2])
+    """
+    
+    # State saved by snapshot()
+    _STATE = ['center', 'sigma_s', 'lam', 'L', 'k', 'ewma', 'var']
+    
+    def __init__(self, center, sigma_s, lam=0.2, L=3):
+        self.center = float(center)
+        self.sigma_s = float(sigma_s)
+        self.lam = float(lam)
+        self.L = float(L)
+        # number of subgroups, current EWMA, and its variance
+        self.k = 0
+        self.ewma = self.center
+        self.var = 0.0
+    
+    def __repr__(self):
+        return f"OnlineEWMA(subgroups={self.k}, ewma={self.ewma:.4g})"
+    
+    @classmethod
+    def from_data(cls, x, y=None, lam=0.2, L=3):
+        """
+        Start a chart from Phase I data, using its xbbar and the sigma_s from get_stat_s()
+        """
+        stat = get_stat_s(x, y)
+        return cls(center=stat['xbbar'].iloc[0], sigma_s=stat['sigma_s'].iloc[0], lam=lam, L=L)
+    
+    def update(self, y, x=None):
+        """
+        Add one subgroup and return its EWMA, current limits, and status
+        
+        Parameters
+        ----------
+        y : array-like
+            Metric values in the new subgroup
+        x : optional
+            Subgroup value (usually time). Default is None, which numbers subgroups 1, 2, 3...
+        
+        Returns
+        -------
+        dict
+            Dictionary with keys: x, xbar, nw, ewma, xbbar, se, lower, upper, out
+        """
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        y = y[~np.isnan(y)]
+        xbar, nw = float(y.mean()), len(y)
+        lam = self.lam
+        
+        self.k += 1
+        self.ewma = lam * xbar + (1 - lam) * self.ewma
+        self.var = lam**2 * self.sigma_s**2 / nw + (1 - lam)**2 * self.var
+        
+        se = float(np.sqrt(self.var))
+        lower, upper = self.center - self.L * se, self.center + self.L * se
+        return {'x': self.k if x is None else x, 'xbar': xbar, 'nw': nw, 'ewma': self.ewma,
+                'xbbar': self.center, 'se': se, 'lower': lower, 'upper': upper,
+                'out': bool((self.ewma < lower) or (self.ewma > upper))}
+    
+    def snapshot(self):
+        """
+        Return the chart's state as a dictionary of plain numbers
+        """
+        return {k: np.asarray(getattr(self, k)).item() for k in self._STATE}
+    
+    @classmethod
+    def restore(cls, state):
+        """
+        Rebuild a chart from the output of snapshot()
+        """
+        chart = cls(center=state['center'], sigma_s=state['sigma_s'], lam=state['lam'], L=state['L'])
+        for k in cls._STATE:
+            setattr(chart, k, state[k])
+        return chart
+
+
+def ggewma(x, y=None, lam=0.2, L=3, xlab="Time (Subgroups)", ylab="EWMA"):
+    """
+    Exponentially Weighted Moving Average Chart with ggplot
+    
+    Creates an EWMA control chart showing the smoothed subgroup means over time,
+    with the raw subgroup means in grey, and time-varying control limits.
+    
+    Parameters
+    ----------
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
+        Vector of subgroup values (usually time). Must be same length as y.
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
+        Vector of metric values (e.g., performance). Must be same length as x.
+    lam : float, optional
+        Weight given to each new subgroup mean, between 0 and 1. Default is 0.2.
+    L : float, optional
+        Width of the control limits, in standard errors. Default is 3.
+    xlab : str, optional
+        Label for x-axis. Default is "Time (Subgroups)".
+    ylab : str, optional
+        Label for y-axis. Default is "EWMA".
+    
+    Returns
+    -------
+    ggplot
+        A control chart visualization
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> ggewma(x=water['time'], y=water['temp'], lam=0.2, xlab="Time (Subgroups)", ylab="EWMA")
+    """
+    from plotnine import ggplot, aes, geom_ribbon, geom_hline, geom_line, geom_point, geom_label, labs
+    
+    # Get subgroup statistics, with time-varying UCL and LCL
+    stat_s = limits_ewma(x=x, y=y, lam=lam, L=L)
+    
+    # Generate labels
+    labels = get_labels(stat_s)
+    
+    # Make visual
+    gg = (ggplot() +
+          geom_hline(data=stat_s.head(1), mapping=aes(yintercept='xbbar'), color="lightgrey") +
+          geom_ribbon(data=stat_s, mapping=aes(x='x', ymin='lower', ymax='upper'),
+                     fill="steelblue", alpha=0.2) +
+          geom_point(data=stat_s, mapping=aes(x='x', y='xbar'), color="grey") +
+          geom_line(data=stat_s, mapping=aes(x='x', y='ewma'), size=1) +
+          geom_point(data=stat_s, mapping=aes(x='x', y='ewma'), size=5) +
+          geom_label(data=labels, mapping=aes(x='x', y='value', label='text'),
+                    ha='right') +  # horizontally justify labels
+          labs(x=xlab, y=ylab, subtitle="Exponentially Weighted Moving Average Chart"))
+    
+    return gg
+
+
+def _cusum_sigma(data):
+    """
+    Process sigma for a CUSUM chart: the pooled sigma_s for subgroups, or the
+    average moving range over d2 for individuals (as in limits_mr())
+    """
+    if np.all(data.nw == 1):
+        return np.abs(np.diff(data.xbar)).mean() / _constant(2)['d2']
+    return data.sigma_s
+
+
+def limits_cusum(x, y=None, k=0.5, h=5):
+    """
+    Get Upper and Lower Decision Limits for a Tabular CUSUM Chart
+    
+    Accumulates standardized deviations of each subgroup mean (or individual value)
+    from the grand mean, in an upper sum that catches upward shifts and a lower sum
+    that catches downward shifts. Deviations smaller than k standard errors are
+    ignored, and a sum past h standard errors signals a shift. Both sums are
+    computed without a Python loop, from cumulative sums and running minima.
+    
+    Parameters
+    ----------
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
+        Vector of subgroup values (usually time). Must be same length as y.
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed. If every subgroup has one value, it is treated as a
+        chart of individuals, with sigma estimated from the moving range.
+    y : array-like, optional
+        Vector of metric values (e.g., performance). Must be same length as x.
+    k : float, optional
+        Allowance (slack), in standard errors. Default is 0.5.
+    h : float, optional
+        Decision interval, in standard errors. Default is 5.
+    
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: x, xbar, nw, xbbar, sigma, se, cplus, cminus, lower, upper
+        One row per subgroup. cplus and cminus are in standard errors, with cminus <= 0.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> limits_cusum(x=water['time'], y=water['temp'], k=0.5, h=5)
+    """
+    data = _as_stats(x, y)
+    xbar = data.xbar
+    xbbar = xbar.mean()
+    sigma = _cusum_sigma(data)
+    se = sigma / np.sqrt(data.nw)
+    z = (xbar - xbbar) / se
+    
+    # C[t] = max(0, C[t-1] + w[t]) is S[t] - min(0, min(S[:t+1])) where S = cumsum(w)
+    s_plus = np.cumsum(z - k)
+    cplus = s_plus - np.minimum(np.minimum.accumulate(s_plus), 0)
+    s_minus = np.cumsum(z + k)
+    cminus = s_minus - np.maximum(np.maximum.accumulate(s_minus), 0)
+    
+    stat = pd.DataFrame({'x': data.x, 'xbar': xbar, 'nw': data.nw})
+    stat['xbbar'] = xbbar
+    stat['sigma'] = sigma
+    stat['se'] = se
+    stat['cplus'] = cplus
+    stat['cminus'] = cminus
+    stat['lower'] = -float(h)
+    stat['upper'] = float(h)
+    
+    return stat
+
+
+class OnlineCUSUM:
+    """
+    Streaming Tabular CUSUM Chart
+    
+    Holds the upper and lower cumulative sums and updates them in constant time as
+    each new subgroup (or individual value) arrives. Uses the same sums as limits_cusum().
+    
+    Parameters
+    ----------
+    center : float
+        Target mean, usually xbbar from Phase I data
+    sigma : float
+        Process sigma, usually sigma_s from get_stat_s() (or mrbar / d2 for individuals)
+    k : float, optional
+        Allowance (slack), in standard errors. Default is 0.5.
+    h : float, optional
+        Decision interval, in standard errors. Default is 5.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> chart = OnlineCUSUM.from_data(x=water['time'], y=water['temp'])
+    >>> chart.update(y=[44.1, 45.0, 43.8, 46.2])
+    """
+    
+    # State saved by snapshot()
+    _STATE = ['center', 'sigma', 'k', 'h', 'count', 'cplus', 'cminus']
+    
+    def __init__(self, center, sigma, k=0.5, h=5):
+        self.center = float(center)
+        self.sigma = float(sigma)
+        self.k = float(k)
+        self.h = float(h)
+        # number of subgroups, and the upper and lower sums
+        self.count = 0
+        self.cplus = 0.0
+        self.cminus = 0.0
+    
+    def __repr__(self):
+        return f"OnlineCUSUM(subgroups={self.count}, cplus={self.cplus:.4g}, cminus={self.cminus:.4g})"
+    
+    @classmethod
+    def from_data(cls, x, y=None, k=0.5, h=5):
+        """
+        Start a chart from Phase I data, using its xbbar and sigma as in limits_cusum()
+        """
+        data = _as_stats(x, y)
+        return cls(center=data.xbar.mean(), sigma=_cusum_sigma(data), k=k, h=h)
+    
+    def update(self, y, x=None):
+        """
+        Add one subgroup and return its cumulative sums and status
+        
+        Parameters
+        ----------
+        y : float or array-like
+            Metric value(s) in the new subgroup
+        x : optional
+            Subgroup value (usually time). Default is None, which numbers subgroups 1, 2, 3...
+        
+        Returns
+        -------
+        dict
+            Dictionary with keys: x, xbar, nw, cplus, cminus, lower, upper, out
+        """
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        y = y[~np.isnan(y)]
+        xbar, nw = float(y.mean()), len(y)
+        z = (xbar - self.center) / (self.sigma / np.sqrt(nw))
+        
+        self.count += 1
+        self.cplus = max(0.0, self.cplus + z - self.k)
+        self.cminus = min(0.0, self.cminus + z + self.k)
+        
+        return {'x': self.count if x is None else x, 'xbar': xbar, 'nw': nw,
+                'cplus': self.cplus, 'cminus': self.cminus, 'lower': -self.h, 'upper': self.h,
+                'out': bool((self.cplus > self.h) or (self.cminus < -self.h))}
+    
+    def snapshot(self):
+        """
+        Return the chart's state as a dictionary of plain numbers
+        """
+        return {k: np.asarray(getattr(self, k)).item() for k in self._STATE}
+    
+    @classmethod
+    def restore(cls, state):
+        """
+        Rebuild a chart from the output of snapshot()
+        """
+        chart = cls(center=state['center'], sigma=state['sigma'], k=state['k'], h=state['h'])
+        for k in cls._STATE:
+            setattr(chart, k, state[k])
+        return chart
+
+
+def ggcusum(x, y=None, k=0.5, h=5, xlab="Time (Subgroups)", ylab="Cumulative Sum (SE)"):
+    """
+    Tabular CUSUM Chart with ggplot
+    
+    Creates a CUSUM chart showing the upper (positive) and lower (negative)
+    cumulative sums over time, against the decision limits at plus and minus h.
+    
+    Parameters
+    ----------
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
+        Vector of subgroup values (usually time). Must be same length as y.
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
+        Vector of metric values (e.g., performance). Must be same length as x.
+    k : float, optional
+        Allowance (slack), in standard errors. Default is 0.5.
+    h : float, optional
+        Decision interval, in standard errors. Default is 5.
+    xlab : str, optional
+        Label for x-axis. Default is "Time (Subgroups)".
+    ylab : str, optional
+        Label for y-axis. Default is "Cumulative Sum (SE)".
+    
+    Returns
+    -------
+    ggplot
+        A control chart visualization
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> ggcusum(x=water['time'], y=water['temp'], k=0.5, h=5)
+    """
+    from plotnine import ggplot, aes, geom_hline, geom_line, geom_point, geom_label, labs
+    
+    # Get cumulative sums and decision limits
+    stat = limits_cusum(x=x, y=y, k=k, h=h)
+    
+    # Generate labels
+    labels = pd.DataFrame({
+        'x': [stat['x'].max()] * 2,
+        'value': [h, -h],
+        'text': [f"+{h:g} SE", f"-{h:g} SE"]
+    })
+    
+    # Make visual
+    gg = (ggplot() +
+          geom_hline(yintercept=0, color="lightgrey") +
+          geom_hline(yintercept=[h, -h], linetype="dashed", color="steelblue") +
+          geom_line(data=stat, mapping=aes(x='x', y='cplus'), size=1) +
+          geom_point(data=stat, mapping=aes(x='x', y='cplus'), size=5) +
+          geom_line(data=stat, mapping=aes(x='x', y='cminus'), size=1) +
+          geom_point(data=stat, mapping=aes(x='x', y='cminus'), size=5) +
+          geom_label(data=labels, mapping=aes(x='x', y='value', label='text'),
+                    ha='right') +  # horizontally justify labels
+          labs(x=xlab, y=ylab, subtitle="Tabular CUSUM Chart"))
+    
+    return gg
+
+
+def cp(sigma_s, upper, lower):
+    """
+    Capability Index (for centered, stable processes)
+    
+    Calculates the process capability index Cp, which measures the potential capability 
+    of a centered, stable process. Cp compares the process spread (6*sigma_s) to the 
+    specification width.
+    
+    Parameters
+    ----------
+    sigma_s : float
+        Within-subgroup standard deviation (short-term variation)
+    upper : float
+        Upper specification limit
+    lower : float
+        Lower specification limit
+    
+    Returns
+    -------
+    float
+        A single numeric value representing the Cp index. Values > 1 indicate the 
+        process spread is smaller than the specification width.
+    
+    Examples
+    --------
+    >>> # Calculate Cp for a process with sigma_s = 2, USL = 100, LSL = 80
+    >>> cp(sigma_s=2, upper=100, lower=80)
+    >>> # Cp = (100 - 80) / (6 * 2) = 20 / 12 = 1.67
+    """
+    return abs(upper - lower) / (6*sigma_s)
+
+
+def pp(sigma_t, upper, lower):
+    """
+    Process Performance Index (for centered, unstable processes)
+    
+    Calculates the process performance index Pp, which measures the potential performance 
+    of a centered process using total variation. Pp compares the process spread (6*sigma_t) 
+    to the specification width.
+    
+    Parameters
+    ----------
+    sigma_t : float
+        Total standard deviation (long-term variation)
+    upper : float
+        Upper specification limit
+    lower : float
+        Lower specification limit
+    
+    Returns
+    -------
+    float
+        A single numeric value representing the Pp index. Values > 1 indicate the 
+        process spread is smaller than the specification width.
+    
+    Examples
+    --------
+    >>> # Calculate Pp for a process with sigma_t = 2.5, USL = 100, LSL = 80
+    >>> pp(sigma_t=2.5, upper=100, lower=80)
+    >>> # Pp = (100 - 80) / (6 * 2.5) = 20 / 15 = 1.33
+    """
+    return abs(upper - lower) / (6*sigma_t)
+
+
+def cpk(mu, sigma_s, lower=None, upper=None):
+    """
+    Capability Index (for uncentered, stable processes)
+    
+    Calculates the process capability index Cpk, which measures the actual capability 
+    of a stable process that may not be centered. Cpk considers both the process mean 
+    location and within-subgroup variation.
+    
+    Parameters
+    ----------
+    mu : float
+        Process mean
+    sigma_s : float
+        Within-subgroup standard deviation (short-term variation)
+    lower : float, optional
+        Lower specification limit. If None, only upper limit is used.
+    upper : float, optional
+        Upper specification limit. If None, only lower limit is used.
+    
+    Returns
+    -------
+    float
+        A single numeric value representing the Cpk index. Returns the minimum of the 
+        upper and lower capability ratios if both limits are provided, otherwise returns 
+        the appropriate one-sided ratio. Values > 1 indicate the process is capable.
+    
+    Examples
+    --------
+    >>> # Calculate Cpk with both limits
+    >>> cpk(mu=90, sigma_s=2, lower=80, upper=100)
+    >>> 
+    >>> # Calculate Cpk with only upper limit
+    >>> cpk(mu=90, sigma_s=2, upper=100)
+    >>> 
+    >>> # Calculate Cpk with only lower limit
+    >>> cpk(mu=90, sigma_s=2, lower=80)
+    """
+    a = None
+    b = None
+    if lower is not None:
+        a = abs(mu - lower) / (3*sigma_s)
+    if upper is not None:
+        b = abs(upper - mu) / (3*sigma_s)
+    if (lower is not None) and (upper is not None):
+        return np.minimum(a, b)
+    return a if upper is None else b
+
+
+def ppk(mu, sigma_t, lower=None, upper=None):
+    """
+    Process Performance Index (for uncentered, unstable processes)
+    
+    Calculates the process performance index Ppk, which measures the actual performance 
+    of a process that may not be centered or stable. Ppk considers both the process mean 
+    location and total variation.
+    
+    Parameters
+    ----------
+    mu : float
+        Process mean
+    sigma_t : float
+        Total standard deviation (long-term variation)
+    lower : float, optional
+        Lower specification limit. If None, only upper limit is used.
+    upper : float, optional
+        Upper specification limit. If None, only lower limit is used.
+    
+    Returns
+    -------
+    float
+        A single numeric value representing the Ppk index. Returns the minimum of the 
+        upper and lower performance ratios if both limits are provided, otherwise returns 
+        the appropriate one-sided ratio. Values > 1 indicate the process is performing 
+        within specifications.
+    
+    Examples
+    --------
+    >>> # Calculate Ppk with both limits
+    >>> ppk(mu=90, sigma_t=2.5, lower=80, upper=100)
     >>> 
     >>> # Calculate Ppk with only upper limit
     >>> ppk(mu=90, sigma_t=2.5, upper=100)
@@ -1318,13 +3880,174 @@ def ppk(mu, sigma_t, lower=None, upper=None):
     if upper is not None:
         b = abs(upper - mu) / (3*sigma_t)
     if (lower is not None) and (upper is not None):
-        return min(a, b)
+        return np.minimum(a, b)
     return a if upper is None else b
 
 
-def get_index(x, y, index="cp", upper=None, lower=None,
+def _index_value(mu, sigma_s, sigma_t, index, upper, lower):
+    """
+    Calculate one capability/performance index from (arrays of) mu, sigma_s, and sigma_t.
+    Also takes the one-sided indices cpu, cpl, ppu, and ppl.
+    """
+    if index == "cp":
+        return cp(sigma_s=sigma_s, upper=upper, lower=lower)
+    elif index == "pp":
+        return pp(sigma_t=sigma_t, upper=upper, lower=lower)
+    elif index == "cpk":
+        return cpk(mu=mu, sigma_s=sigma_s, upper=upper, lower=lower)
+    elif index == "ppk":
+        return ppk(mu=mu, sigma_t=sigma_t, upper=upper, lower=lower)
+    elif index == "cpu":
+        return cpk(mu=mu, sigma_s=sigma_s, upper=upper)
+    elif index == "cpl":
+        return cpk(mu=mu, sigma_s=sigma_s, lower=lower)
+    elif index == "ppu":
+        return ppk(mu=mu, sigma_t=sigma_t, upper=upper)
+    elif index == "ppl":
+        return ppk(mu=mu, sigma_t=sigma_t, lower=lower)
+
+
+# Replicates per bootstrap block (each block gets its own random stream),
+# and the largest number of cells drawn at once
+_BOOT_BLOCK = 500
+_BOOT_CELLS = 2**22
+
+
+def _boot_subgroups(data, counts):
+    """
+    Get mu, sigma_s, and sigma_t for each bootstrap replicate, given a
+    (replicates x subgroups) matrix of how often each subgroup was drawn
+    """
+    xbar = data.xbar
+    # Deviations of subgroup means from the grand mean, for stable sums of squares
+    d = xbar - data.total.sum() / data.n
+    N = counts @ data.nw
+    mu = counts @ xbar / len(data)
+    sigma_s = np.sqrt(counts @ data.m2 / (counts @ data.df))
+    dbar = counts @ (data.nw * d) / N
+    ss = counts @ data.m2 + counts @ (data.nw * d**2) - N * dbar**2
+    sigma_t = np.sqrt(ss / (N - 1))
+    return mu, sigma_s, sigma_t
+
+
+def _boot_individuals(data, codes, y, idx):
+    """
+    Get mu, sigma_s, and sigma_t for each bootstrap replicate, given a
+    (replicates x observations) matrix of drawn observation indices
+    """
+    reps, n = idx.shape
+    groups = len(data)
+    # Deviations from each value's subgroup mean and from the grand mean
+    xbar = data.xbar
+    d = (y - xbar[codes])[idx]
+    e = (y - data.total.sum() / data.n)[idx]
+    # Sum within each (replicate, subgroup) cell
+    key = (np.arange(reps)[:, None] * groups + codes[idx]).ravel()
+    size = reps * groups
+    nw = np.bincount(key, minlength=size).reshape(reps, groups)
+    dsum = np.bincount(key, weights=d.ravel(), minlength=size).reshape(reps, groups)
+    dsq = np.bincount(key, weights=(d * d).ravel(), minlength=size).reshape(reps, groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m2 = np.where(nw > 0, np.maximum(dsq - dsum**2 / nw, 0), 0)
+        means = np.where(nw > 0, xbar + dsum / nw, 0)
+    # Subgroups that were never drawn drop out, as they would from subgroup_stats()
+    mu = means.sum(axis=1) / (nw > 0).sum(axis=1)
+    sigma_s = np.sqrt(m2.sum(axis=1) / np.maximum(nw - 1, 0).sum(axis=1))
+    sigma_t = np.sqrt((np.sum(e * e, axis=1) - e.sum(axis=1)**2 / n) / (n - 1))
+    return mu, sigma_s, sigma_t
+
+
+def _index_analytic(index, estimate, n, df, ci_level=0.95):
+    """
+    Closed-form standard error and confidence interval for a capability/performance
+    index, given its estimate, the number of observations n, and the degrees of
+    freedom df behind its sigma. Works on arrays.
+    
+    cp and pp use the exact chi-square interval, since estimate / true value is
+    distributed as sqrt(df / chi-square(df)). cpk, ppk, and the one-sided indices
+    use Bissell's normal approximation, se = sqrt(1 / (9n) + estimate^2 / (2 df)).
+    """
+    alpha = 1 - ci_level
+    if index in ["cp", "pp"]:
+        se = estimate * np.sqrt(1 / (2 * df))
+        lower = estimate * np.sqrt(stats.chi2.ppf(alpha/2, df) / df)
+        upper = estimate * np.sqrt(stats.chi2.ppf(1 - alpha/2, df) / df)
+    else:
+        se = np.sqrt(1 / (9 * n) + estimate**2 / (2 * df))
+        z = stats.norm.ppf(1 - alpha/2)
+        lower, upper = estimate - z * se, estimate + z * se
+    return se, lower, upper
+
+
+def _index_df(data, index):
+    """
+    Degrees of freedom behind an index's sigma: pooled within subgroups for the
+    capability indices (sigma_s), or n - 1 for the performance indices (sigma_t)
+    """
+    return data.df.sum() if index.startswith("c") else data.n - 1
+
+
+def _boot_block(data, codes, y, by_subgroup, size, seed):
+    """
+    Draw one block of bootstrap replicates from its own SeedSequence, and return
+    a (3 x size) array of mu, sigma_s, and sigma_t. Runs in worker processes.
+    """
+    rng = np.random.default_rng(seed)
+    if by_subgroup:
+        # Tally draws of subgroups into a multinomial (replicates x subgroups) count matrix
+        groups = len(data)
+        key = (np.arange(size)[:, None] * groups + rng.integers(0, groups, size=(size, groups))).ravel()
+        counts = np.bincount(key, minlength=size * groups).reshape(size, groups)
+        return np.array(_boot_subgroups(data, counts))
+    idx = rng.integers(0, len(y), size=(size, len(y)))
+    return np.array(_boot_individuals(data, codes, y, idx))
+
+
+def _bootstrap(summary, reps, by_subgroup=True, seed=None, n_jobs=1, executor=None):
+    """
+    Bootstrap mu, sigma_s, and sigma_t from a SubgroupSummary, in fixed-size blocks
+    that each get an independent random stream spawned from seed, so the results
+    depend only on seed, never on how blocks are spread over workers.
+    """
+    data = summary.stats
+    codes, y = None, None
+    if by_subgroup:
+        cells = len(data)
+    else:
+        # Resampling individual observations needs the raw values
+        if summary.raw is None:
+            raise ValueError("resampling observations needs the raw x and y values; pass x and y, or a SubgroupSummary built from them")
+        xs, y = np.asarray(summary.raw[0]), np.asarray(summary.raw[1], dtype=float)
+        keep = ~(pd.isna(xs) | np.isnan(y))
+        codes = pd.factorize(xs[keep], sort=True)[0]
+        y = y[keep]
+        cells = len(y)
+    
+    # Split replicates into blocks, each with its own child seed
+    block = max(min(_BOOT_BLOCK, _BOOT_CELLS // cells), 1)
+    sizes = [min(block, reps - start) for start in range(0, reps, block)]
+    # Without a seed, SeedSequence() draws fresh entropy from the OS
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(len(sizes))
+    tasks = ([data] * len(sizes), [codes] * len(sizes), [y] * len(sizes),
+             [by_subgroup] * len(sizes), sizes, seeds)
+    
+    if executor is not None:
+        blocks = list(executor.map(_boot_block, *tasks))
+    elif n_jobs == 1 or len(sizes) == 1:
+        blocks = list(map(_boot_block, *tasks))
+    else:
+        workers = os.cpu_count() if n_jobs is None or n_jobs < 0 else n_jobs
+        with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+            blocks = list(pool.map(_boot_block, *tasks))
+    return np.concatenate(blocks, axis=1)
+
+
+def get_index(x, y=None, index="cp", upper=None, lower=None,
               bootstrap_reps=1000, ci_level=0.95,
-              by_subgroup=True):
+              by_subgroup=True, seed=None, n_jobs=1, executor=None,
+              method="bootstrap"):
     """
     Bootstrap Process Capability/Performance Index with Confidence Intervals
     
@@ -1334,9 +4057,13 @@ def get_index(x, y, index="cp", upper=None, lower=None,
     
     Parameters
     ----------
-    x : array-like
+    x : array-like, SubgroupSummary, or pd.DataFrame
         Vector of subgroup values (usually time). Must be same length as y.
-    y : array-like
+        Or, a SubgroupSummary, or a summary table with one row per subgroup
+        (see SubgroupStats.from_summary()), in which case y is not needed.
+        Resampling individual observations (by_subgroup=False) needs the raw
+        x and y, or a SubgroupSummary built from them.
+    y : array-like, optional
         Vector of metric values (e.g., performance). Must be same length as x.
     index : str, optional
         One of "cp", "pp", "cpk", "ppk". Default is "cp".
@@ -1349,14 +4076,38 @@ def get_index(x, y, index="cp", upper=None, lower=None,
     ci_level : float, optional
         Confidence level for intervals. Default is 0.95.
     by_subgroup : bool, optional
-        If True, resample subgroups with replacement (preserves subgroup structure). 
+        If True, resample subgroups with replacement (preserves subgroup structure), 
+        counting a subgroup drawn twice as two subgroups. 
         If False, resample individual observations. Default is True.
+    seed : int or np.random.SeedSequence, optional
+        Seed for the bootstrap. Results for a given seed are identical for any n_jobs
+        or executor. Default is None, which draws fresh entropy from the OS.
+    n_jobs : int, optional
+        Number of worker processes to split replicates across. -1 uses every CPU.
+        Default is 1 (no worker processes).
+    executor : concurrent.futures.Executor, optional
+        An existing executor to run replicate blocks on, used instead of n_jobs.
+        Default is None.
+    method : str, optional
+        "bootstrap" to resample, or "analytic" for closed-form intervals: exact
+        chi-square intervals for cp and pp, and Bissell's normal approximation for
+        cpk and ppk. The analytic intervals assume a normal, stable process, and
+        ignore bootstrap_reps, by_subgroup, seed, n_jobs, and executor.
+        Default is "bootstrap".
     
     Returns
     -------
     pd.DataFrame
         DataFrame with columns: term, estimate, se, lower, upper
     
+    Notes
+    -----
+    Replicates are computed from each subgroup's count, mean, and sum of squares, so
+    resampling subgroups only draws a matrix of counts (one row per replicate) and
+    takes a few matrix products, without re-grouping any raw data. Replicates are drawn
+    in fixed-size blocks, each with its own stream spawned from seed, which is what
+    lets them run in parallel and still match a serial run exactly.
+    
     Examples
     --------
     >>> import pandas as pd
@@ -1369,12 +4120,22 @@ def get_index(x, y, index="cp", upper=None, lower=None,
     >>> # Bootstrap Cpk index with individual resampling
     >>> get_index(x=water['time'], y=water['temp'], index="cpk", 
     ...           upper=80, lower=42, by_subgroup=False)
+    >>> 
+    >>> # Reproducible bootstrap, split across 4 processes
+    >>> get_index(x=water['time'], y=water['temp'], index="cp", 
+    ...           upper=80, lower=42, bootstrap_reps=10000, seed=1, n_jobs=4)
+    >>> 
+    >>> # Closed-form intervals, without resampling
+    >>> get_index(x=water['time'], y=water['temp'], index="cpk", 
+    ...           upper=80, lower=42, method="analytic")
     """
     import warnings
     
-    # Validate index
+    # Validate index and method
     if index not in ["cp", "pp", "cpk", "ppk"]:
         raise ValueError("index must be one of: cp, pp, cpk, ppk")
+    if method not in ["bootstrap", "analytic"]:
+        raise ValueError("method must be one of: bootstrap, analytic")
     
     # Validate specification limits
     if index in ["cp", "pp"]:
@@ -1385,83 +4146,30 @@ def get_index(x, y, index="cp", upper=None, lower=None,
             raise ValueError("at least one of upper or lower specification limit is required for cpk and ppk")
     
     # Warn if bootstrap_reps < 500
-    if bootstrap_reps < 500:
+    if method == "bootstrap" and bootstrap_reps < 500:
         warnings.warn("bootstrap_reps < 500 may result in unreliable confidence intervals", 
                      UserWarning)
     
-    # Make a data.frame
-    data = pd.DataFrame({'x': pd.Series(x), 'y': pd.Series(y)})
+    # Group the data once, reusing a SubgroupSummary if given
+    summary = _as_summary(x, y)
+    data = summary.stats
     
     # Calculate observed index
-    if index == "cp":
-        stat_s = get_stat_s(x=x, y=y)
-        sigma_s = stat_s['sigma_s'].iloc[0]
-        estimate = cp(sigma_s=sigma_s, upper=upper, lower=lower)
-    elif index == "pp":
-        stat_t = get_stat_t(x=x, y=y)
-        sigma_t = stat_t['sigma_t'].iloc[0]
-        estimate = pp(sigma_t=sigma_t, upper=upper, lower=lower)
-    elif index == "cpk":
-        stat_s = get_stat_s(x=x, y=y)
-        stat_t = get_stat_t(x=x, y=y)
-        mu = stat_t['xbbar'].iloc[0]
-        sigma_s = stat_s['sigma_s'].iloc[0]
-        estimate = cpk(mu=mu, sigma_s=sigma_s, 
-                      upper=upper, lower=lower)
-    elif index == "ppk":
-        stat_t = get_stat_t(x=x, y=y)
-        mu = stat_t['xbbar'].iloc[0]
-        sigma_t = stat_t['sigma_t'].iloc[0]
-        estimate = ppk(mu=mu, sigma_t=sigma_t,
-                      upper=upper, lower=lower)
-    
-    # Bootstrap loop
-    boot_values = []
-    
-    for i in range(bootstrap_reps):
-        if by_subgroup:
-            # Resample subgroups with replacement
-            subgroups = data['x'].unique()
-            sampled_subgroups = np.random.choice(subgroups, size=len(subgroups), replace=True)
-            
-            # Create bootstrap sample by combining sampled subgroups
-            boot_data_list = []
-            for sg in sampled_subgroups:
-                sg_data = data[data['x'] == sg].copy()
-                boot_data_list.append(sg_data)
-            boot_data = pd.concat(boot_data_list, ignore_index=True)
-        else:
-            # Resample individual observations with replacement
-            boot_data = data.sample(n=len(data), replace=True).reset_index(drop=True)
-        
-        # Calculate index for bootstrap sample
-        if index == "cp":
-            boot_stat_s = get_stat_s(x=boot_data['x'], y=boot_data['y'])
-            boot_sigma_s = boot_stat_s['sigma_s'].iloc[0]
-            boot_values.append(cp(sigma_s=boot_sigma_s, upper=upper, lower=lower))
-        elif index == "pp":
-            boot_stat_t = get_stat_t(x=boot_data['x'], y=boot_data['y'])
-            boot_sigma_t = boot_stat_t['sigma_t'].iloc[0]
-            boot_values.append(pp(sigma_t=boot_sigma_t, upper=upper, lower=lower))
-        elif index == "cpk":
-            boot_stat_s = get_stat_s(x=boot_data['x'], y=boot_data['y'])
-            boot_stat_t = get_stat_t(x=boot_data['x'], y=boot_data['y'])
-            boot_mu = boot_stat_t['xbbar'].iloc[0]
-            boot_sigma_s = boot_stat_s['sigma_s'].iloc[0]
-            boot_values.append(cpk(mu=boot_mu, sigma_s=boot_sigma_s,
-                                  upper=upper, lower=lower))
-        elif index == "ppk":
-            boot_stat_t = get_stat_t(x=boot_data['x'], y=boot_data['y'])
-            boot_mu = boot_stat_t['xbbar'].iloc[0]
-            boot_sigma_t = boot_stat_t['sigma_t'].iloc[0]
-            boot_values.append(ppk(mu=boot_mu, sigma_t=boot_sigma_t,
-                                  upper=upper, lower=lower))
-    
-    # Calculate standard error and confidence intervals
-    boot_values = np.array(boot_values)
-    se = boot_values.std()
-    alpha = 1 - ci_level
-    ci_bounds = np.quantile(boot_values, [alpha/2, 1 - alpha/2])
+    estimate = _index_value(data.xbar.mean(), data.sigma_s, data.sigma_t, index, upper, lower)
+    
+    if method == "analytic":
+        # Closed-form standard error and confidence interval
+        se, *ci_bounds = _index_analytic(index, estimate, data.n, _index_df(data, index), ci_level)
+    else:
+        # Bootstrap from the per-subgroup sufficient statistics
+        boot_values = _index_value(*_bootstrap(summary, bootstrap_reps, by_subgroup=by_subgroup,
+                                               seed=seed, n_jobs=n_jobs, executor=executor),
+                                   index, upper, lower)
+    
+        # Calculate standard error and confidence intervals
+        se = boot_values.std()
+        alpha = 1 - ci_level
+        ci_bounds = np.quantile(boot_values, [alpha/2, 1 - alpha/2])
     
     # Return tidy DataFrame
     output = pd.DataFrame({
@@ -1473,4 +4181,446 @@ def get_index(x, y, index="cp", upper=None, lower=None,
     })
     
     return output
-    
\ No newline at end of file
+    
+
+
+def capability_table(x, y=None, upper=None, lower=None, one_sided=False,
+                     bootstrap_reps=1000, ci_level=0.95,
+                     by_subgroup=True, seed=None, n_jobs=1, executor=None,
+                     method="bootstrap"):
+    """
+    Bootstrap Every Process Capability/Performance Index at Once
+    
+    Like get_index(), but draws one set of bootstrap resamples and calculates every
+    index the specification limits allow from it: cp and pp (when both limits are
+    given), cpk and ppk, and optionally the one-sided cpu, cpl, ppu, and ppl.
+    
+    Parameters
+    ----------
+    x : array-like, SubgroupSummary, or pd.DataFrame
+        Vector of subgroup values (usually time). Must be same length as y.
+        Or, a SubgroupSummary, or a summary table with one row per subgroup
+        (see SubgroupStats.from_summary()), in which case y is not needed.
+        Resampling individual observations (by_subgroup=False) needs the raw
+        x and y, or a SubgroupSummary built from them.
+    y : array-like, optional
+        Vector of metric values (e.g., performance). Must be same length as x.
+    upper : float, optional
+        Upper specification limit.
+    lower : float, optional
+        Lower specification limit. At least one of upper or lower is required.
+    one_sided : bool, optional
+        If True, also return the one-sided indices (cpu and ppu for the upper limit,
+        cpl and ppl for the lower limit). Default is False.
+    bootstrap_reps : int, optional
+        Number of bootstrap replicates. Default is 1000. A warning is issued if < 500.
+    ci_level : float, optional
+        Confidence level for intervals. Default is 0.95.
+    by_subgroup : bool, optional
+        If True, resample subgroups with replacement. If False, resample individual
+        observations. Default is True.
+    seed : int or np.random.SeedSequence, optional
+        Seed for the bootstrap, as in get_index(). Default is None.
+    n_jobs : int, optional
+        Number of worker processes, as in get_index(). Default is 1.
+    executor : concurrent.futures.Executor, optional
+        An existing executor, as in get_index(). Default is None.
+    method : str, optional
+        "bootstrap" or "analytic", as in get_index(). Default is "bootstrap".
+    
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: term, estimate, se, lower, upper
+        One row per index.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> capability_table(x=water['time'], y=water['temp'], upper=80, lower=42)
+    >>> capability_table(x=water['time'], y=water['temp'], lower=42, one_sided=True)
+    """
+    import warnings
+    
+    # Pick the indices the specification limits allow
+    if method not in ["bootstrap", "analytic"]:
+        raise ValueError("method must be one of: bootstrap, analytic")
+    if upper is None and lower is None:
+        raise ValueError("at least one of upper or lower specification limit is required")
+    terms = ["cp", "pp"] if (upper is not None and lower is not None) else []
+    terms += ["cpk", "ppk"]
+    if one_sided:
+        terms += (["cpu", "ppu"] if upper is not None else []) + (["cpl", "ppl"] if lower is not None else [])
+    
+    # Warn if bootstrap_reps < 500
+    if method == "bootstrap" and bootstrap_reps < 500:
+        warnings.warn("bootstrap_reps < 500 may result in unreliable confidence intervals", 
+                     UserWarning)
+    
+    # Group the data once, reusing a SubgroupSummary if given
+    summary = _as_summary(x, y)
+    data = summary.stats
+    observed = (data.xbar.mean(), data.sigma_s, data.sigma_t)
+    estimates = np.array([_index_value(*observed, term, upper, lower) for term in terms])
+    
+    if method == "analytic":
+        # Closed-form standard errors and confidence intervals
+        se, *ci_bounds = np.array([
+            _index_analytic(term, estimate, data.n, _index_df(data, term), ci_level)
+            for term, estimate in zip(terms, estimates)]).T
+    else:
+        # Draw the resamples once, then calculate every index from them
+        boot = _bootstrap(summary, bootstrap_reps, by_subgroup=by_subgroup,
+                          seed=seed, n_jobs=n_jobs, executor=executor)
+        boot_values = np.array([_index_value(*boot, term, upper, lower) for term in terms])
+    
+        # Calculate standard errors and confidence intervals
+        se = boot_values.std(axis=1)
+        alpha = 1 - ci_level
+        ci_bounds = np.quantile(boot_values, [alpha/2, 1 - alpha/2], axis=1)
+    
+    # Return tidy DataFrame
+    output = pd.DataFrame({
+        'term': terms,
+        'estimate': estimates,
+        'se': se,
+        'lower': ci_bounds[0],
+        'upper': ci_bounds[1]
+    })
+    
+    return output
+
+
+def capability_batch(data, specs, feature="feature", x="subgroup", y="value",
+                     upper="upper", lower="lower", one_sided=False):
+    """
+    Capability/Performance Indices for Many Features at Once
+    
+    Groups a long data frame of measurements by feature and subgroup in one pass,
+    then calculates cp, pp, cpk, and ppk for every feature against its own
+    specification limits, with array math instead of a loop over features.
+    
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Long data frame with one row per measurement.
+    specs : pd.DataFrame
+        Specification table with one row per feature. Missing limits (NaN) are
+        treated as one-sided specifications.
+    feature : str, optional
+        Name of the feature column, in both data and specs. Default is "feature".
+    x : str, optional
+        Name of the subgroup column in data (usually time). Default is "subgroup".
+    y : str, optional
+        Name of the metric column in data. Default is "value".
+    upper : str, optional
+        Name of the upper specification limit column in specs. Default is "upper".
+    lower : str, optional
+        Name of the lower specification limit column in specs. Default is "lower".
+    one_sided : bool, optional
+        If True, also return the one-sided indices cpu, cpl, ppu, and ppl. Default is False.
+    
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: feature, n, subgroups, mu, sigma_s, sigma_t, upper, lower,
+        cp, pp, cpk, ppk (and cpu, cpl, ppu, ppl if one_sided).
+        One row per feature in data. Indices are NaN where the limits they need are missing.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> metrics = water.melt(id_vars=['id', 'time'], value_vars=['temp', 'ph', 'sulfur'])
+    >>> specs = pd.DataFrame({'variable': ['temp', 'ph'], 'upper': [80, 7.5], 'lower': [42, None]})
+    >>> capability_batch(metrics, specs, feature='variable', x='time', y='value')
+    """
+    # Group by feature, then subgroup, in one pass
+    stats = subgroup_stats(x=data[x], y=data[y], stream=data[feature])
+    keys = stats.stream_keys()
+    
+    # Line up each feature's specification limits
+    limits = specs.drop_duplicates(subset=feature, keep='last').set_index(feature)
+    limits = limits.reindex(pd.Index(keys, name=feature))
+    usl = limits[upper].to_numpy(dtype=float)
+    lsl = limits[lower].to_numpy(dtype=float)
+    
+    output = pd.DataFrame({
+        feature: keys,
+        'n': stats.stream_sum(stats.nw),
+        'subgroups': np.diff(np.r_[stats.stream_starts, len(stats)]),
+        'mu': stats.stream_mean(stats.xbar),
+        'sigma_s': stats.stream_sigma_s(),
+        'sigma_t': stats.stream_sigma_t(),
+        'upper': usl,
+        'lower': lsl
+    })
+    
+    # Calculate every index for every feature at once
+    mu, sigma_s, sigma_t = output['mu'].to_numpy(), output['sigma_s'].to_numpy(), output['sigma_t'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cpu, cpl = cpk(mu=mu, sigma_s=sigma_s, upper=usl), cpk(mu=mu, sigma_s=sigma_s, lower=lsl)
+        ppu, ppl = ppk(mu=mu, sigma_t=sigma_t, upper=usl), ppk(mu=mu, sigma_t=sigma_t, lower=lsl)
+        output['cp'] = cp(sigma_s=sigma_s, upper=usl, lower=lsl)
+        output['pp'] = pp(sigma_t=sigma_t, upper=usl, lower=lsl)
+    # Take the worse side, or the only side given
+    output['cpk'] = np.fmin(cpu, cpl)
+    output['ppk'] = np.fmin(ppu, ppl)
+    if one_sided:
+        output['cpu'], output['cpl'], output['ppu'], output['ppl'] = cpu, cpl, ppu, ppl
+    
+    return output
+
+
+class QuantileSketch:
+    """
+    Mergeable Quantile Sketch
+    
+    A t-digest: keeps a bounded set of weighted centroids that summarize any number of
+    values, sized so that centroids are small near the tails (where capability
+    percentiles live) and large in the middle. Build it chunk by chunk with update(),
+    combine sketches from separate workers with merge(), and read quantiles with quantile().
+    
+    Parameters
+    ----------
+    compression : int, optional
+        Accuracy/size tradeoff; the sketch keeps about compression / 2 centroids.
+        Default is 1000, which puts the 0.135th and 99.865th percentiles within
+        about 0.1% of their exact values.
+    
+    Attributes
+    ----------
+    means, weights : np.ndarray
+        Mean and count of each centroid, sorted by mean
+    count : float
+        Number of values added
+    min, max : float
+        Smallest and largest value added
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> sketch = QuantileSketch()
+    >>> for chunk in np.array_split(water['temp'], 4):
+    ...     sketch.update(chunk)
+    >>> sketch.quantile([0.00135, 0.5, 0.99865])
+    """
+    
+    def __init__(self, compression=1000):
+        self.compression = compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.min = np.inf
+        self.max = -np.inf
+        # values not yet folded into centroids
+        self._buffer = []
+        self._buffered = 0
+    
+    def __repr__(self):
+        self._compress()
+        return f"QuantileSketch(count={self.count:g}, centroids={len(self.means)})"
+    
+    @property
+    def count(self):
+        """Number of values added"""
+        return self.weights.sum() + self._buffered
+    
+    def update(self, values):
+        """
+        Add a chunk of values (NaN is skipped), and return the sketch
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._buffer.append(values)
+        self._buffered += len(values)
+        if self._buffered > 10 * self.compression:
+            self._compress()
+        return self
+    
+    def merge(self, other):
+        """
+        Fold another QuantileSketch into this one, and return this sketch
+        """
+        other._compress()
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.means = np.r_[self.means, other.means]
+        self.weights = np.r_[self.weights, other.weights]
+        self._compress()
+        return self
+    
+    def _compress(self):
+        """
+        Fold buffered values into the centroids, then merge neighboring centroids
+        that fall in the same bucket of the k1 scale function
+        """
+        means = np.concatenate([self.means] + self._buffer)
+        weights = np.concatenate([self.weights] + [np.ones(len(b)) for b in self._buffer])
+        self._buffer, self._buffered = [], 0
+        if len(means) == 0:
+            return
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        # Quantile at the left edge of each centroid, mapped to a bucket on the k1 scale
+        cum = np.cumsum(weights)
+        q = (cum - weights) / cum[-1]
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+    
+    def quantile(self, q):
+        """
+        Estimate the quantile(s) q, between 0 and 1
+        """
+        self._compress()
+        if len(self.means) == 0:
+            return np.full(np.shape(q), np.nan)[()]
+        # Interpolate between centroid midpoints, pinned to the min and max at the ends
+        cum = np.cumsum(self.weights)
+        total = cum[-1]
+        position = np.r_[0, cum - self.weights / 2, total]
+        value = np.r_[self.min, self.means, self.max]
+        return np.interp(np.asarray(q, dtype=float) * total, position, value)
+
+
+def capability_percentile(y, upper=None, lower=None, compression=1000):
+    """
+    Percentile-Method Capability Indices (for non-normal processes)
+    
+    Calculates Cp and Cpk equivalents without assuming normality, by replacing the
+    mean with the median and the 3-sigma spreads with the distances from the median
+    to the 0.135th and 99.865th percentiles (Clements' method). Percentiles come from
+    a QuantileSketch, so very large or chunked data never needs a full sort.
+    
+    Parameters
+    ----------
+    y : array-like, iterable of array-likes, or QuantileSketch
+        Metric values, a sequence of chunks of metric values, or a sketch already
+        built from them (e.g. merged from several workers).
+    upper : float, optional
+        Upper specification limit.
+    lower : float, optional
+        Lower specification limit. At least one of upper or lower is required.
+    compression : int, optional
+        Size of the QuantileSketch built from y. Default is 1000.
+    
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: term, estimate
+        cp (when both limits are given) and cpk.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> capability_percentile(water['temp'], upper=80, lower=42)
+    >>> 
+    >>> # Build the sketch chunk by chunk
+    >>> capability_percentile(np.array_split(water['temp'], 4), upper=80, lower=42)
+    """
+    if upper is None and lower is None:
+        raise ValueError("at least one of upper or lower specification limit is required")
+    
+    # Build a sketch, unless given one
+    if isinstance(y, QuantileSketch):
+        sketch = y
+    else:
+        sketch = QuantileSketch(compression=compression)
+        if isinstance(y, (list, tuple)) or (not hasattr(y, '__array__') and hasattr(y, '__iter__')):
+            for chunk in y:
+                sketch.update(chunk)
+        else:
+            sketch.update(y)
+    
+    # Percentile spreads stand in for 3 sigma on each side of the median
+    low, median, high = sketch.quantile([0.00135, 0.5, 0.99865])
+    terms, estimates = [], []
+    if upper is not None and lower is not None:
+        terms.append("cp")
+        estimates.append(abs(upper - lower) / (high - low))
+    a = abs(median - lower) / (median - low) if lower is not None else np.nan
+    b = abs(upper - median) / (high - median) if upper is not None else np.nan
+    terms.append("cpk")
+    estimates.append(np.fmin(a, b))
+    
+    return pd.DataFrame({'term': terms, 'estimate': estimates})
+
+
+def rolling_index(x, y=None, window=30, upper=None, lower=None):
+    """
+    Rolling Process Capability/Performance Indices
+    
+    Calculates sigma_s, sigma_t, cp, pp, cpk, and ppk over a trailing window of
+    subgroups, at every window position. Each window's statistics come from
+    differences of running sums of the per-subgroup count, sum, and sum of squares,
+    so the whole trend takes one pass over the subgroups.
+    
+    Parameters
+    ----------
+    x : array-like, SubgroupStats, SubgroupSummary, or pd.DataFrame
+        Vector of subgroup values (usually time). Must be same length as y.
+        Or, the output of subgroup_stats(), a SubgroupSummary, or a summary table
+        with one row per subgroup (see SubgroupStats.from_summary()), in which case
+        y is not needed.
+    y : array-like, optional
+        Vector of metric values (e.g., performance). Must be same length as x.
+    window : int, optional
+        Number of subgroups in each window. Default is 30.
+    upper : float, optional
+        Upper specification limit.
+    lower : float, optional
+        Lower specification limit. At least one of upper or lower is required.
+    
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with columns: x, n, mu, sigma_s, sigma_t, cp, pp, cpk, ppk
+        (cp and pp only when both limits are given).
+        One row per complete window, labeled by its last subgroup.
+    
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> water = pd.read_csv("workshops/onsen.csv")
+    >>> rolling_index(x=water['time'], y=water['temp'], window=4, upper=80, lower=42)
+    """
+    if upper is None and lower is None:
+        raise ValueError("at least one of upper or lower specification limit is required")
+    if window < 1:
+        raise ValueError("window must be at least 1 subgroup")
+    
+    data = _as_stats(x, y)
+    xbar = data.xbar
+    # Deviations from the grand mean, for stable sums of squares
+    d = xbar - data.total.sum() / data.n
+    
+    # Window sums are differences of running sums, window subgroups apart
+    def window_sum(values):
+        running = np.r_[0, np.cumsum(values)]
+        return running[window:] - running[:-window]
+    
+    n = window_sum(data.nw)
+    mu = window_sum(xbar) / window
+    dsum = window_sum(data.nw * d)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma_s = np.sqrt(window_sum(data.m2) / window_sum(data.df))
+        ss = window_sum(data.m2) + window_sum(data.nw * d**2) - dsum**2 / n
+        sigma_t = np.sqrt(np.maximum(ss, 0) / (n - 1))
+    
+    output = pd.DataFrame({'x': data.x[window - 1:], 'n': n, 'mu': mu,
+                           'sigma_s': sigma_s, 'sigma_t': sigma_t})
+    if upper is not None and lower is not None:
+        output['cp'] = cp(sigma_s=sigma_s, upper=upper, lower=lower)
+        output['pp'] = pp(sigma_t=sigma_t, upper=upper, lower=lower)
+    output['cpk'] = cpk(mu=mu, sigma_s=sigma_s, upper=upper, lower=lower)
+    output['ppk'] = ppk(mu=mu, sigma_t=sigma_t, upper=upper, lower=lower)
+    
+    return output
@@ -3,10 +3,15 @@
 
 # Import the functions
 from functions.functions_process_control import (
-    describe, ggprocess, get_stat_s, get_stat_t, get_labels,
-    dn, bn, limits_avg, limits_s, limits_r, limits_mr,
-    ggxbar, ggs, ggr, ggmr, ggp, ggnp, ggu,
-    cp, pp, cpk, ppk, get_index
+    describe, ggprocess, subgroup_stats, SubgroupSummary, get_stat_s, get_stat_t, get_labels,
+    SubgroupAccumulator, read_subgroups, read_arrow, MeasurementStore,
+    control_constants, simulate_constants, dn, bn, limits_avg, limits_s, limits_r, limits_mr,
+    ggxbar, ggs, ggr, ggmr, limits_p, limits_np, limits_u, ggp, ggnp, ggu, OnlineChart,
+    OnlineAttributeChart,
+    freeze_limits, nelson_rules, get_rules, RuleMonitor, limits_ewma, OnlineEWMA, ggewma,
+    limits_cusum, OnlineCUSUM, ggcusum,
+    cp, pp, cpk, ppk, get_index, capability_table, capability_batch,
+    QuantileSketch, capability_percentile, rolling_index
 )
 import numpy as np
 import pandas as pd
@@ -86,7 +91,7 @@ result.show()
 # Note: requires t (time), x (defects)
 t2 = np.arange(1, 11)
 x2 = np.array([5, 7, 4, 8, 6, 7, 5, 6, 8, 7])
-result = ggu(t=t2, x=x2, xlab="Time (Subgroups)", ylab="Number of Defects (u)")
+result = ggu(t=t2, x=x2, xlab="Time (Subgroups)", ylab="Defects per Product (u)")
 result.show()
 
 # Example 19: cp
@@ -103,3 +108,203 @@ ppk(mu=90, sigma_t=2.5, lower=80, upper=100)
 
 # Example 23: get_index
 get_index(x=water['time'], y=water['temp'], index="cp", upper=100, lower=80)
+
+# Example 24: control_constants
+# Exact constants, cached in memory and saved next to dn.csv and bn.csv
+control_constants(n=range(2, 51), path="workshops/constants.csv")
+
+# Example 25: simulate_constants
+# Simulated constants for a skewed (exponential) parent distribution
+from scipy import stats
+simulate_constants(n=5, reps=1000000, dist=stats.expon(), seed=1)
+
+# Example 26: subgroup_stats
+# Group the data once, then reuse it for every statistic and chart
+data = subgroup_stats(x=water['time'], y=water['temp'])
+get_stat_s(data)
+get_stat_t(data)
+limits_avg(data)
+limits_s(data)
+limits_r(data)
+
+# Example 27: SubgroupSummary
+# Statistics and limits are computed on first use, then cached
+summary = SubgroupSummary(x=water['time'], y=water['temp'])
+summary.sigma_s
+summary.limits_avg
+result = ggxbar(summary, xlab="Time (Subgroups)", ylab="Average")
+result = ggs(summary, xlab="Time (Subgroups)", ylab="Standard Deviation")
+get_index(summary, index="cp", upper=80, lower=42)
+
+# Example 28: OnlineChart
+# Load the history once, then update limits as each new subgroup arrives
+chart = OnlineChart()
+chart.update_batch(x=water['time'], y=water['temp'])
+chart.update(y=[44.1, 45.0, 43.8, 46.2], x=17)
+state = chart.snapshot()
+chart = OnlineChart.restore(state)
+
+# Example 29: freeze_limits
+# Estimate limits on Phase I data, then score Phase II data against them
+phase1 = water[water['time'] <= 7]
+phase2 = water[water['time'] > 7]
+frozen = freeze_limits(x=phase1['time'], y=phase1['temp'], chart="xbar")
+frozen.score(x=phase2['time'], y=phase2['temp'])
+frozen = freeze_limits(x=t, y=x, n=n, chart="p")
+frozen.score(x=t, y=x, n=n)
+
+# Example 30: stream
+# Compute limits for many processes in one call, in long format
+metrics = water.melt(id_vars=['id', 'time'], value_vars=['temp', 'ph', 'sulfur'])
+get_stat_t(x=metrics['time'], y=metrics['value'], stream=metrics['variable'])
+limits_avg(x=metrics['time'], y=metrics['value'], stream=metrics['variable'])
+
+# Example 31: get_rules
+# Flag Nelson rule violations as a bitmask per point
+get_rules(limits_s(x=water['time'], y=water['temp']))
+stat = limits_avg(x=water['time'], y=water['temp'])
+nelson_rules(stat['xbar'], stat['xbbar'], stat['upper'], stat['lower'])
+# Or check points one at a time as they arrive
+monitor = RuleMonitor()
+point = chart.update(y=[44.1, 45.0, 43.8, 46.2])
+monitor.update(point['xbar'], point['xbbar'], point['xbar_upper'], point['xbar_lower'])
+
+# Example 32: limits_ewma
+# Smooth subgroup means to catch small, persistent shifts
+limits_ewma(x=water['time'], y=water['temp'], lam=0.2, L=3)
+ggewma(x=water['time'], y=water['temp'], lam=0.2)
+# Or update the EWMA one subgroup at a time
+ewma = OnlineEWMA.from_data(x=water['time'], y=water['temp'], lam=0.2)
+ewma.update(y=[44.1, 45.0, 43.8, 46.2], x=17)
+
+# Example 33: limits_cusum
+# Accumulate deviations from the mean to catch sustained shifts
+limits_cusum(x=water['time'], y=water['temp'], k=0.5, h=5)
+ggcusum(x=water['time'], y=water['temp'], k=0.5, h=5)
+# Or update the sums one subgroup at a time
+cusum = OnlineCUSUM.from_data(x=water['time'], y=water['temp'])
+cusum.update(y=[44.1, 45.0, 43.8, 46.2], x=17)
+
+# Example 34: get_index with seed and n_jobs
+# Reproducible bootstrap; the same seed gives the same result for any n_jobs
+# (n_jobs > 1 starts worker processes, so call it under if __name__ == "__main__":)
+get_index(x=water['time'], y=water['temp'], index="cp", upper=80, lower=42,
+          bootstrap_reps=10000, seed=1)
+
+# Example 35: capability_table
+# Every index, with confidence intervals, from one set of resamples
+capability_table(x=water['time'], y=water['temp'], upper=80, lower=42, seed=1)
+capability_table(x=water['time'], y=water['temp'], lower=42, one_sided=True, seed=1)
+
+# Example 36: get_index with method="analytic"
+# Closed-form intervals, without resampling
+get_index(x=water['time'], y=water['temp'], index="cp", upper=80, lower=42, method="analytic")
+capability_table(x=water['time'], y=water['temp'], upper=80, lower=42, method="analytic")
+
+# Example 37: capability_batch
+# Every index for every feature, each against its own specification limits
+specs = pd.DataFrame({'variable': ['temp', 'ph', 'sulfur'], 'upper': [80, 7.5, None], 'lower': [42, 6.5, 0]})
+capability_batch(metrics, specs, feature='variable', x='time', y='value')
+
+# Example 38: capability_percentile
+# Capability without assuming normality, from a sketch built chunk by chunk
+sketch = QuantileSketch()
+for chunk in np.array_split(water['sulfur'], 4):
+    sketch.update(chunk)
+sketch.quantile([0.00135, 0.5, 0.99865])
+capability_percentile(sketch, lower=0)
+
+# Example 39: rolling_index
+# Capability trend over a trailing window of subgroups
+rolling_index(x=water['time'], y=water['temp'], window=4, upper=80, lower=42)
+
+# Example 40: summary tables
+# Use per-subgroup n, mean, sd, min, and max in place of raw measurements
+table = water.groupby('time')['temp'].agg(n='count', mean='mean', sd='std', min='min', max='max').reset_index()
+table = table.rename(columns={'time': 'x'})
+limits_avg(table)
+limits_r(table)
+get_index(table, index="cp", upper=80, lower=42, seed=1)
+
+# Example 41: SubgroupAccumulator
+# Accumulate statistics in shards (e.g. on separate workers), then merge them
+shards = [water[water['id'] <= 80], water[water['id'] > 80]]
+parts = [SubgroupAccumulator().update(x=shard['time'], y=shard['temp']).to_bytes() for shard in shards]
+accumulator = SubgroupAccumulator()
+for part in parts:
+    accumulator.merge(SubgroupAccumulator.from_bytes(part))
+limits_avg(accumulator.stats())
+
+# Example 42: read_subgroups
+# Read a file too large for memory in chunks, keeping only subgroup statistics
+subgroups = read_subgroups("workshops/onsen.csv", x="time", y="temp", chunksize=50)
+limits_avg(subgroups.stats())
+limits_r(subgroups.stats())
+# Several metrics at once, one stream each
+subgroups = read_subgroups("workshops/onsen.csv", x="time", y=["temp", "ph", "sulfur"], chunksize=50)
+limits_s(subgroups.stats())
+
+# Example 43: read_arrow
+# Read only the needed columns and subgroups from Arrow / Parquet data (needs pyarrow)
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+if pa is not None:
+    table = pa.Table.from_pandas(water, preserve_index=False)
+    limits_avg(read_arrow(table, x="time", y="temp").stats())
+    limits_s(read_arrow(table, x="time", y="temp", x_range=(5, 11)).stats())
+
+# Example 44: MeasurementStore
+# Keep a long history on disk, and read only the subgroups needed
+import tempfile
+store = MeasurementStore(tempfile.mkdtemp())
+store.append(subgroup=water['time'], value=water['temp'])
+limits_avg(store)
+limits_s(store.stats(first=5, last=11))
+limits_mr(store, first=5, last=11)
+
+# Example 45: as_arrays
+# Compact NumPy results, for calling limits in tight loops
+data = subgroup_stats(x=water['time'], y=water['temp'])
+result = limits_avg(data, as_arrays=True)
+result.upper, result.xbbar
+limits_s(data, as_arrays=True).sbar
+
+# Example 46: limits_p, limits_np, limits_u
+# Attribute chart limits without plotting (or importing plotnine), for many lines at once
+limits_p(t=t, x=x, n=n)
+lines = np.repeat(['line A', 'line B'], 10)
+limits_np(t=np.tile(t, 2), x=np.r_[x, x * 2], n=np.tile(n, 2), stream=lines)
+limits_u(t=np.tile(t2, 2), x=np.r_[x2, x2 + 1], stream=lines)
+
+# Example 47: OnlineAttributeChart
+# Update p, np, u, or c chart limits as each inspection result arrives
+chart = OnlineAttributeChart("p")
+chart.update_batch(x=t, y=x, n=n)
+chart.update(y=6, n=100)
+# Freeze the limits to score Phase II samples
+frozen = chart.freeze()
+frozen.score(x=[12, 13], y=[2, 7], n=[100, 100])
+chart = OnlineAttributeChart.restore(chart.snapshot())
+# c chart: defects per sample of constant size
+counts = OnlineAttributeChart("c")
+counts.update_batch(x=t2, y=x2)
+counts.update(y=15)
+# Compare: frozen limits score the same statistic as the online chart, and match
+# its limits and status for the latest sample, for every chart type
+units = np.repeat(t2, 3)
+defects = np.tile(x2, 3) // 3
+sizes = np.array([4, 5, 3, 5, 4, 5, 4, 3, 5, 4])
+for kind, tk, yk, nk in [("p", t, x, n), ("np", t, x, n), ("u", units, defects, None),
+                         ("u", t2, x2, sizes), ("c", t2, x2, None)]:
+    online = OnlineAttributeChart(kind)
+    batch = online.update_batch(x=tk, y=yk, n=nk)
+    scored = online.freeze().score(x=tk, y=yk, n=nk)
+    side = pd.DataFrame({
+        kind: batch[kind].to_numpy(), 'frozen_' + kind: scored[kind].to_numpy(),
+        'upper': batch['upper'].to_numpy(), 'frozen_upper': scored['upper'].to_numpy(),
+        'out': batch['out'].to_numpy(), 'frozen_out': scored['out'].to_numpy()
+    })
+    print(kind, "chart: online vs. frozen")
+    print(side.tail(3))